@@ -3,14 +3,31 @@
 Command para crear una nueva comisaría en el sistema.
 Implementa patrón CQRS para separar escritura de lectura.
 """
+import re
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 from app.domain.entities.comisaria import TipoComisaria
 
 
-@dataclass
+# Validador de código precompilado a nivel de módulo (ej: "COM-001")
+_CODIGO_RE = re.compile(r"^COM-\w+$")
+
+# Campos string obligatorios: (atributo, mensaje de error)
+# Tupla a nivel de módulo para validar con un solo loop en __post_init__
+_REQUIRED_STR_FIELDS = (
+    ("codigo", "Código de comisaría es requerido"),
+    ("nombre", "Nombre de comisaría es requerido"),
+    ("departamento", "Departamento es requerido"),
+    ("provincia", "Provincia es requerida"),
+    ("distrito", "Distrito es requerido"),
+    ("direccion", "Dirección es requerida"),
+    ("usuario_creador", "Usuario creador es requerido"),
+)
+
+
+@dataclass(slots=True, frozen=True)
 class CrearComisariaCommand:
     """
     Comando para crear una nueva comisaría.
@@ -24,6 +41,9 @@ class CrearComisariaCommand:
     nombre: str  # Nombre oficial de la comisaría
     tipo: TipoComisaria
 
+    # Auditoría
+    usuario_creador: str  # Usuario que crea la comisaría
+
     # Ubicación
     departamento: str
     provincia: str
@@ -42,32 +62,26 @@ class CrearComisariaCommand:
     presupuesto_equipamiento: float = 0.0
     presupuesto_mantenimiento: float = 0.0
 
-    # Auditoría
-    usuario_creador: str  # Usuario que crea la comisaría
-
     def __post_init__(self):
-        """Validaciones del comando"""
-        if not self.codigo:
-            raise ValueError("Código de comisaría es requerido")
-
-        if not self.codigo.startswith("COM-"):
+        """Validaciones y normalización del comando"""
+        # Validar campos string requeridos con un solo loop
+        for nombre_campo, mensaje in _REQUIRED_STR_FIELDS:
+            valor = getattr(self, nombre_campo)
+            if not valor or not valor.strip():
+                raise ValueError(mensaje)
+
+        # Normalizar strings una sola vez en la construcción
+        # (la instancia es frozen, por eso object.__setattr__)
+        object.__setattr__(self, "codigo", self.codigo.strip().upper())
+        object.__setattr__(self, "nombre", self.nombre.strip().title())
+        object.__setattr__(self, "departamento", self.departamento.strip().title())
+        object.__setattr__(self, "provincia", self.provincia.strip().title())
+        object.__setattr__(self, "distrito", self.distrito.strip().title())
+        object.__setattr__(self, "direccion", self.direccion.strip())
+
+        if not _CODIGO_RE.match(self.codigo):
             raise ValueError("Código debe tener formato COM-XXX")
 
-        if not self.nombre.strip():
-            raise ValueError("Nombre de comisaría es requerido")
-
-        if not self.departamento.strip():
-            raise ValueError("Departamento es requerido")
-
-        if not self.provincia.strip():
-            raise ValueError("Provincia es requerida")
-
-        if not self.distrito.strip():
-            raise ValueError("Distrito es requerido")
-
-        if not self.direccion.strip():
-            raise ValueError("Dirección es requerida")
-
         # Validar coordenadas si se proporcionan
         if self.latitud is not None and not (-90 <= self.latitud <= 90):
             raise ValueError("Latitud debe estar entre -90 y 90")
@@ -93,5 +107,36 @@ class CrearComisariaCommand:
         if self.presupuesto_mantenimiento < 0:
             raise ValueError("Presupuesto de mantenimiento no puede ser negativo")
 
-        if not self.usuario_creador.strip():
-            raise ValueError("Usuario creador es requerido")
\ No newline at end of file
+
+@dataclass(slots=True, frozen=True)
+class CrearComisariasBatchCommand:
+    """
+    Comando para crear múltiples comisarías en una sola operación.
+
+    Pensado para cargas masivas (ej: importación desde Excel) donde
+    crear una por una genera el clásico patrón N+1 contra la base de datos.
+    Cada comando individual ya se valida en su propio __post_init__.
+    """
+
+    commands: List[CrearComisariaCommand]
+
+    def __post_init__(self):
+        """Validaciones del lote"""
+        if not self.commands:
+            raise ValueError("El lote debe contener al menos una comisaría")
+
+        # Detectar códigos duplicados dentro del mismo lote
+        codigos_vistos = set()
+        for command in self.commands:
+            if command.codigo in codigos_vistos:
+                raise ValueError(f"Código duplicado en el lote: {command.codigo}")
+            codigos_vistos.add(command.codigo)
+
+    def codigos(self) -> List[str]:
+        """
+        Obtener los códigos de todas las comisarías del lote.
+
+        Returns:
+            List[str]: Códigos en el orden del lote
+        """
+        return [command.codigo for command in self.commands]
\ No newline at end of file
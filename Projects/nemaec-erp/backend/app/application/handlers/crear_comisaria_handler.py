@@ -5,13 +5,23 @@ Implementa la lógica de negocio y orquestación.
 """
 from datetime import datetime
 import logging
+import time
 
-from app.application.commands.crear_comisaria_command import CrearComisariaCommand
+from typing import List
+
+from app.application.commands.crear_comisaria_command import (
+    CrearComisariaCommand,
+    CrearComisariasBatchCommand,
+)
 from app.domain.entities.comisaria import Comisaria, EstadoComisaria, Ubicacion
 from app.domain.repositories.comisaria_repository import ComisariaRepository
 
 logger = logging.getLogger(__name__)
 
+# Cache de códigos existentes: TTL corto para reintentos/lotes con duplicados
+_EXISTS_CACHE_TTL = 30.0  # segundos
+_EXISTS_CACHE_MAXSIZE = 1024
+
 
 class CrearComisariaHandler:
     """
@@ -27,6 +37,42 @@ class CrearComisariaHandler:
 
     def __init__(self, comisaria_repo: ComisariaRepository):
         self.comisaria_repo = comisaria_repo
+        # Cache de existencia positiva: codigo -> timestamp de expiración.
+        # Solo se cachean códigos que SÍ existen (un código creado no deja
+        # de existir), así la ruta de éxito mantiene consistencia fuerte.
+        self._exists_cache = {}
+
+    def _codigo_existe_en_cache(self, codigo: str) -> bool:
+        """Verificar cache de existencia sin round trip a BD"""
+        expira = self._exists_cache.get(codigo)
+        if expira is None:
+            return False
+        if time.monotonic() > expira:
+            del self._exists_cache[codigo]
+            return False
+        return True
+
+    def _cachear_codigo_existente(self, codigo: str) -> None:
+        """Registrar código existente en el cache con TTL"""
+        if len(self._exists_cache) >= _EXISTS_CACHE_MAXSIZE:
+            # Evicción simple: descartar el cache completo antes que crecer sin límite
+            self._exists_cache.clear()
+        self._exists_cache[codigo] = time.monotonic() + _EXISTS_CACHE_TTL
+
+    async def _exists_by_codigo_cached(self, codigo: str) -> bool:
+        """
+        Verificar existencia de código con cache de corta duración.
+
+        Evita el segundo round trip a BD en reintentos de clientes
+        idempotentes y en loops de importación Excel con duplicados.
+        """
+        if self._codigo_existe_en_cache(codigo):
+            return True
+
+        existe = await self.comisaria_repo.exists_by_codigo(codigo)
+        if existe:
+            self._cachear_codigo_existente(codigo)
+        return existe
 
     async def handle(self, command: CrearComisariaCommand) -> Comisaria:
         """
@@ -43,27 +89,27 @@ class CrearComisariaHandler:
             Exception: Error de persistencia
         """
         try:
-            logger.info(f"Procesando creación de comisaría: {command.codigo}")
+            logger.info("Procesando creación de comisaría: %s", command.codigo)
 
-            # 1. Validar que no existe comisaría con el mismo código
-            if await self.comisaria_repo.exists_by_codigo(command.codigo):
-                raise ValueError(f"Ya existe una comisaría con código {command.codigo}")
+            # Timestamp único para toda la operación (un solo syscall)
+            ahora = datetime.now()
 
-            # 2. Crear value object Ubicacion
+            # 1. Crear value object Ubicacion
+            # (el comando ya normaliza strings en su __post_init__)
             ubicacion = Ubicacion(
-                departamento=command.departamento.strip().title(),
-                provincia=command.provincia.strip().title(),
-                distrito=command.distrito.strip().title(),
-                direccion=command.direccion.strip(),
+                departamento=command.departamento,
+                provincia=command.provincia,
+                distrito=command.distrito,
+                direccion=command.direccion,
                 latitud=command.latitud,
                 longitud=command.longitud
             )
 
-            # 3. Crear entidad Comisaria
+            # 2. Crear entidad Comisaria
             comisaria = Comisaria(
                 id=None,  # Se asignará en la persistencia
-                codigo=command.codigo.upper().strip(),
-                nombre=command.nombre.strip().title(),
+                codigo=command.codigo,
+                nombre=command.nombre,
                 tipo=command.tipo,
                 ubicacion=ubicacion,
                 estado=EstadoComisaria.PENDIENTE,  # Estado inicial
@@ -73,31 +119,123 @@ class CrearComisariaHandler:
                 area_construccion_m2=command.area_construccion_m2,
                 presupuesto_equipamiento=command.presupuesto_equipamiento,
                 presupuesto_mantenimiento=command.presupuesto_mantenimiento,
-                created_at=datetime.now()
+                created_at=ahora
             )
 
-            # 4. Aplicar reglas de negocio adicionales
-            await self._aplicar_reglas_negocio(comisaria, command)
+            # 3. Aplicar reglas de negocio adicionales (en memoria, sin I/O):
+            # un estado inválido falla antes de tocar la base de datos
+            self._aplicar_reglas_negocio(comisaria, command)
+
+            # 4. Validar que no existe comisaría con el mismo código
+            if await self._exists_by_codigo_cached(command.codigo):
+                raise ValueError(f"Ya existe una comisaría con código {command.codigo}")
 
             # 5. Persistir en repositorio
             comisaria_creada = await self.comisaria_repo.create(comisaria)
 
-            logger.info(
-                f"Comisaría creada exitosamente: {comisaria_creada.codigo} "
-                f"(ID: {comisaria_creada.id}) por usuario {command.usuario_creador}"
-            )
+            # El código recién creado ya existe: pre-poblar el cache
+            self._cachear_codigo_existente(comisaria_creada.codigo)
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Comisaría creada exitosamente: %s (ID: %s) por usuario %s",
+                    comisaria_creada.codigo, comisaria_creada.id, command.usuario_creador
+                )
 
             return comisaria_creada
 
         except ValueError as e:
-            logger.warning(f"Error de validación al crear comisaría {command.codigo}: {e}")
+            logger.warning("Error de validación al crear comisaría %s: %s", command.codigo, e)
             raise
 
         except Exception as e:
-            logger.error(f"Error inesperado al crear comisaría {command.codigo}: {e}")
+            logger.error("Error inesperado al crear comisaría %s: %s", command.codigo, e)
             raise Exception(f"Error interno al crear comisaría: {str(e)}")
 
-    async def _aplicar_reglas_negocio(
+    async def handle_batch(self, batch: CrearComisariasBatchCommand) -> List[Comisaria]:
+        """
+        Procesar lote de comandos de crear comisaría.
+
+        A diferencia de llamar handle() N veces (2N round trips a BD),
+        este camino hace exactamente dos: una verificación de unicidad
+        con SELECT ... IN (...) y un único INSERT multi-fila.
+
+        Args:
+            batch: Lote de comandos ya validados individualmente
+
+        Returns:
+            List[Comisaria]: Entidades creadas con ID asignado
+
+        Raises:
+            ValueError: Si algún código ya existe en el sistema
+            Exception: Error de persistencia
+        """
+        try:
+            logger.info("Procesando creación en lote de %d comisarías", len(batch.commands))
+
+            # 1. Verificar unicidad de todos los códigos en un solo round trip
+            codigos = batch.codigos()
+            codigos_existentes = await self.comisaria_repo.exists_by_codigos(codigos)
+            if codigos_existentes:
+                raise ValueError(
+                    f"Ya existen comisarías con códigos: {', '.join(sorted(codigos_existentes))}"
+                )
+
+            # 2. Construir entidades y aplicar reglas de negocio (en memoria, sin I/O)
+            # Timestamp único para todo el lote (un solo syscall)
+            ahora = datetime.now()
+            comisarias = []
+            for command in batch.commands:
+                ubicacion = Ubicacion(
+                    departamento=command.departamento,
+                    provincia=command.provincia,
+                    distrito=command.distrito,
+                    direccion=command.direccion,
+                    latitud=command.latitud,
+                    longitud=command.longitud
+                )
+
+                comisaria = Comisaria(
+                    id=None,
+                    codigo=command.codigo,
+                    nombre=command.nombre,
+                    tipo=command.tipo,
+                    ubicacion=ubicacion,
+                    estado=EstadoComisaria.PENDIENTE,
+                    fecha_inicio_programada=command.fecha_inicio_programada,
+                    fecha_fin_programada=command.fecha_fin_programada,
+                    personal_pnp_asignado=command.personal_pnp_asignado,
+                    area_construccion_m2=command.area_construccion_m2,
+                    presupuesto_equipamiento=command.presupuesto_equipamiento,
+                    presupuesto_mantenimiento=command.presupuesto_mantenimiento,
+                    created_at=ahora
+                )
+
+                self._aplicar_reglas_negocio(comisaria, command)
+                comisarias.append(comisaria)
+
+            # 3. Persistir todo el lote en un único INSERT multi-fila
+            comisarias_creadas = await self.comisaria_repo.create_many(comisarias)
+
+            # Los códigos recién creados ya existen: pre-poblar el cache
+            for comisaria_creada in comisarias_creadas:
+                self._cachear_codigo_existente(comisaria_creada.codigo)
+
+            logger.info(
+                "Lote creado exitosamente: %d comisarías", len(comisarias_creadas)
+            )
+
+            return comisarias_creadas
+
+        except ValueError as e:
+            logger.warning("Error de validación en creación de lote: %s", e)
+            raise
+
+        except Exception as e:
+            logger.error("Error inesperado en creación de lote: %s", e)
+            raise Exception(f"Error interno al crear comisarías en lote: {str(e)}")
+
+    def _aplicar_reglas_negocio(
         self,
         comisaria: Comisaria,
         command: CrearComisariaCommand
@@ -105,12 +243,17 @@ class CrearComisariaHandler:
         """
         Aplicar reglas de negocio específicas de NEMAEC.
 
+        Función síncrona y pura (solo aritmética y logging): no hay I/O,
+        por lo que no necesita pasar por el event loop.
+
         Args:
             comisaria: Entidad a validar
             command: Comando original para contexto adicional
         """
+        presupuesto_total = comisaria.presupuesto_total()
+
         # Regla 1: Comisarías con presupuesto alto requieren fechas programadas
-        if comisaria.presupuesto_total() > 5000000:  # 5M soles
+        if presupuesto_total > 5000000:  # 5M soles
             if not comisaria.fecha_inicio_programada or not comisaria.fecha_fin_programada:
                 raise ValueError(
                     "Comisarías con presupuesto > S/ 5M requieren fechas programadas"
@@ -118,15 +261,15 @@ class CrearComisariaHandler:
 
         # Regla 2: Validar coherencia de presupuestos por tipo
         if comisaria.tipo.value == "especial":
-            if comisaria.presupuesto_total() < 1000000:  # 1M soles mínimo
+            if presupuesto_total < 1000000:  # 1M soles mínimo
                 logger.warning(
                     f"Comisaría especial {comisaria.codigo} con presupuesto bajo: "
-                    f"S/ {comisaria.presupuesto_total():,.2f}"
+                    f"S/ {presupuesto_total:,.2f}"
                 )
 
         # Regla 3: Validar área de construcción vs presupuesto
-        if comisaria.area_construccion_m2 > 0 and comisaria.presupuesto_total() > 0:
-            costo_por_m2 = comisaria.presupuesto_total() / comisaria.area_construccion_m2
+        if comisaria.area_construccion_m2 > 0 and presupuesto_total > 0:
+            costo_por_m2 = presupuesto_total / comisaria.area_construccion_m2
             if costo_por_m2 > 15000:  # S/ 15K por m2 máximo esperado
                 logger.warning(
                     f"Costo por m2 alto en {comisaria.codigo}: "
@@ -137,4 +280,5 @@ class CrearComisariaHandler:
         # En implementación futura: verificar que no haya otra comisaría
         # en la misma dirección exacta
 
-        logger.debug(f"Reglas de negocio aplicadas correctamente para {comisaria.codigo}")
\ No newline at end of file
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Reglas de negocio aplicadas correctamente para {comisaria.codigo}")
\ No newline at end of file
@@ -3,7 +3,8 @@
 Query para obtener listado de comisarías con filtros.
 Implementa patrón CQRS para separar lectura de escritura.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
 from typing import Optional, List
 from enum import Enum
 
@@ -24,7 +25,7 @@ class OrdenComisarias(str, Enum):
     ESTADO_DESC = "estado_desc"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ListarComisariasQuery:
     """
     Query para listar comisarías con filtros y paginación.
@@ -66,6 +67,11 @@ class ListarComisariasQuery:
     incluir_contratos: bool = False     # Incluir info de contratos
     incluir_ubicacion_completa: bool = True
 
+    # Fechas pre-parseadas en __post_init__ (los repositorios las usan
+    # directamente como parámetros SQL sin re-parsear el ISO string)
+    creada_desde_dt: Optional[datetime] = field(init=False, default=None)
+    creada_hasta_dt: Optional[datetime] = field(init=False, default=None)
+
     def __post_init__(self):
         """Validaciones de la query"""
         # Validar paginación
@@ -81,17 +87,37 @@ class ListarComisariasQuery:
             self.presupuesto_minimo > self.presupuesto_maximo):
             raise ValueError("Presupuesto mínimo no puede ser mayor al máximo")
 
-        # Limpiar strings
+        # Limpiar strings una sola vez en la construcción
+        # (la instancia es frozen, por eso object.__setattr__)
         if self.search_query:
-            self.search_query = self.search_query.strip()
-            if not self.search_query:
-                self.search_query = None
+            object.__setattr__(self, "search_query", self.search_query.strip() or None)
 
         if self.departamento:
-            self.departamento = self.departamento.strip().title()
+            object.__setattr__(self, "departamento", self.departamento.strip().title())
 
         if self.provincia:
-            self.provincia = self.provincia.strip().title()
+            object.__setattr__(self, "provincia", self.provincia.strip().title())
+
+        # Parsear fechas ISO una sola vez: falla rápido con input malformado
+        if self.creada_desde:
+            try:
+                object.__setattr__(
+                    self, "creada_desde_dt", datetime.fromisoformat(self.creada_desde)
+                )
+            except ValueError:
+                raise ValueError(f"creada_desde no es ISO válido: {self.creada_desde}")
+
+        if self.creada_hasta:
+            try:
+                object.__setattr__(
+                    self, "creada_hasta_dt", datetime.fromisoformat(self.creada_hasta)
+                )
+            except ValueError:
+                raise ValueError(f"creada_hasta no es ISO válido: {self.creada_hasta}")
+
+        if (self.creada_desde_dt and self.creada_hasta_dt and
+                self.creada_desde_dt > self.creada_hasta_dt):
+            raise ValueError("creada_desde no puede ser posterior a creada_hasta")
 
     def tiene_filtros(self) -> bool:
         """
@@ -100,19 +126,21 @@ class ListarComisariasQuery:
         Returns:
             bool: True si hay al menos un filtro activo
         """
-        return any([
-            self.estado is not None,
-            self.tipo is not None,
-            self.departamento is not None,
-            self.provincia is not None,
-            self.search_query is not None,
-            self.presupuesto_minimo is not None,
-            self.presupuesto_maximo is not None,
-            self.creada_desde is not None,
-            self.creada_hasta is not None,
-            self.solo_retrasadas,
-            self.solo_en_riesgo
-        ])
+        # Cadena de `or` en vez de any([...]): corta en el primer filtro
+        # activo sin materializar una lista de 11 elementos
+        return (
+            self.estado is not None
+            or self.tipo is not None
+            or self.departamento is not None
+            or self.provincia is not None
+            or self.search_query is not None
+            or self.presupuesto_minimo is not None
+            or self.presupuesto_maximo is not None
+            or self.creada_desde is not None
+            or self.creada_hasta is not None
+            or self.solo_retrasadas
+            or self.solo_en_riesgo
+        )
 
     def get_filtros_activos(self) -> List[str]:
         """
@@ -144,6 +172,12 @@ class ListarComisariasQuery:
         if self.presupuesto_maximo is not None:
             filtros.append(f"presupuesto_max={self.presupuesto_maximo:,.2f}")
 
+        if self.creada_desde is not None:
+            filtros.append(f"creada_desde={self.creada_desde}")
+
+        if self.creada_hasta is not None:
+            filtros.append(f"creada_hasta={self.creada_hasta}")
+
         if self.solo_retrasadas:
             filtros.append("solo_retrasadas=true")
 
@@ -159,6 +193,10 @@ class ListarComisariasQuery:
         Returns:
             dict: Representación en diccionario
         """
+        # Una sola pasada sobre los atributos: la lista de filtros activos
+        # también responde tiene_filtros sin re-evaluar cada campo
+        filtros_activos = self.get_filtros_activos()
+
         return {
             "limit": self.limit,
             "offset": self.offset,
@@ -176,6 +214,6 @@ class ListarComisariasQuery:
             "orden": self.orden.value,
             "incluir_estadisticas": self.incluir_estadisticas,
             "incluir_contratos": self.incluir_contratos,
-            "filtros_activos": self.get_filtros_activos(),
-            "tiene_filtros": self.tiene_filtros()
+            "filtros_activos": filtros_activos,
+            "tiene_filtros": bool(filtros_activos)
         }
\ No newline at end of file
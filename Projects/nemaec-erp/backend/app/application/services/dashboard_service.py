@@ -4,18 +4,153 @@ Servicio de aplicación para generar métricas y datos del dashboard crítico.
 Core del sistema de monitoreo nacional de las 132 comisarías.
 """
 from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache, wraps
+import asyncio
+import heapq
 import logging
+import time
+
+import numpy as np
 
 from app.domain.entities.comisaria import Comisaria, EstadoComisaria
 from app.domain.entities.contrato import Contrato, EstadoContrato
 from app.domain.entities.partida import CriticidadPartida
 from app.domain.repositories.comisaria_repository import ComisariaRepository
 from app.domain.repositories.contrato_repository import ContratoRepository
+from app.domain.repositories.dashboard_repository import DashboardRepository
 from app.domain.repositories.partida_repository import PartidaRepository
 
 logger = logging.getLogger(__name__)
 
+# Fechas del proyecto nacional (en un proyecto real vendrían de configuración);
+# constantes de módulo para no reconstruirlas en cada request
+_FECHA_INICIO_PROYECTO = datetime(2026, 1, 1)
+_FECHA_LIMITE_PROYECTO = datetime(2026, 4, 30)  # 4 meses máximo
+_DIAS_TOTALES_PROYECTO = (_FECHA_LIMITE_PROYECTO - _FECHA_INICIO_PROYECTO).days
+
+# Bloques del dashboard como dataclasses con slots en lugar de dicts
+# anónimos: construcción posicional (sin hashear ~20 claves por render),
+# ~40% menos memoria por instancia y menos presión de GC bajo carga.
+# orjson los serializa nativamente, con los nombres de campo como claves.
+
+@dataclass(slots=True)
+class ResumenEjecutivo:
+    """Bloque resumen_ejecutivo del dashboard nacional"""
+    total_comisarias: int
+    comisarias_completadas: int
+    comisarias_en_proceso: int
+    comisarias_pendientes: int
+    dias_transcurridos: int
+    dias_restantes: int
+    porcentaje_tiempo_transcurrido: float
+    presupuesto_total: float
+    presupuesto_ejecutado: float
+    porcentaje_ejecucion_financiera: float
+
+
+@dataclass(slots=True)
+class MetricasAvance:
+    """Bloque metricas_avance del dashboard nacional"""
+    avance_promedio_nacional: float
+    avance_programado_nacional: float
+    diferencia_nacional: float
+    partidas_criticas_total: int
+    total_partidas: int
+
+
+@dataclass(slots=True)
+class PerformanceContratos:
+    """Bloque performance_contratos del dashboard nacional"""
+    contratos_activos: int
+    contratos_vencidos: int
+    contratos_por_vencer: int
+    performance_promedio: float
+
+
+def _async_ttl_cache(ttl: float):
+    """
+    Cache en memoria con TTL para métodos async del dashboard.
+
+    El dashboard es consultado por muchos clientes en paralelo; con un
+    refresh de ~30s en la UI, un TTL corto elimina la gran mayoría de las
+    consultas repetidas a la base. Un lock por clave garantiza que N
+    callers concurrentes compartan un único cálculo en vuelo en lugar de
+    disparar N consultas idénticas (thundering herd).
+
+    El cache se comparte entre instancias del servicio (la clave son solo
+    los argumentos del método); los resultados son dicts/listas planos,
+    sin referencias a sesiones de base de datos. El decorador expone
+    wrapper.invalidate() para los endpoints de mutación.
+    """
+    def decorator(fn):
+        cache: Dict[tuple, tuple] = {}
+        locks: Dict[tuple, asyncio.Lock] = {}
+
+        @wraps(fn)
+        async def wrapper(self, *args):
+            key = args
+            entrada = cache.get(key)
+            if entrada is not None and entrada[0] > time.monotonic():
+                return entrada[1]
+
+            lock = locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                # Re-verificar: otro caller pudo llenar el cache mientras
+                # esperábamos el lock
+                entrada = cache.get(key)
+                if entrada is not None and entrada[0] > time.monotonic():
+                    return entrada[1]
+
+                resultado = await fn(self, *args)
+                cache[key] = (time.monotonic() + ttl, resultado)
+                return resultado
+
+        def invalidate() -> None:
+            """Vaciar el cache (llamar tras mutaciones que afecten el dashboard)"""
+            cache.clear()
+
+        wrapper.invalidate = invalidate
+        return wrapper
+    return decorator
+
+
+_NAT = np.datetime64("NaT")
+
+
+def _a_datetime64(valor: str) -> np.datetime64:
+    """
+    Convertir un timestamp ISO a datetime64, NaT si es inválido.
+
+    Solo se usa como fallback cuando el lote contiene timestamps
+    malformados; el camino normal convierte el lote completo sin levantar
+    excepciones. Captura exacta (ValueError para strings no-ISO,
+    TypeError para tipos inesperados): un bare except aquí escondería
+    bugs reales del repositorio.
+    """
+    try:
+        return np.datetime64(valor, "s")
+    except (ValueError, TypeError):
+        return _NAT
+
+
+@lru_cache(maxsize=1)
+def _performance_general_cached(bucket_minuto: int) -> Dict[str, Any]:
+    """
+    Métricas de performance general, cacheadas por minuto.
+
+    El bucket de minuto actúa como TTL: requests del dashboard dentro
+    del mismo minuto reutilizan el resultado sin recalcular.
+    """
+    # Placeholder para cálculos de performance
+    return {
+        "performance_promedio": 75.5,
+        "ejecucion_financiera": 68.2,
+        "cumplimiento_cronograma": 82.1,
+        "calidad_reportes": 90.3
+    }
+
 
 class DashboardService:
     """
@@ -32,65 +167,110 @@ class DashboardService:
         self,
         comisaria_repo: ComisariaRepository,
         contrato_repo: ContratoRepository,
-        partida_repo: PartidaRepository
+        partida_repo: PartidaRepository,
+        dashboard_repo: Optional[DashboardRepository] = None
     ):
         self.comisaria_repo = comisaria_repo
         self.contrato_repo = contrato_repo
         self.partida_repo = partida_repo
+        # Rollup precalculado (vista materializada); opcional mientras
+        # las implementaciones concretas no estén desplegadas
+        self.dashboard_repo = dashboard_repo
 
+    @_async_ttl_cache(ttl=15.0)
     async def get_dashboard_ejecutivo(self) -> Dict[str, Any]:
         """
         Obtener datos principales del dashboard ejecutivo.
 
+        El resultado se cachea 15 segundos: con la UI de monitoreo
+        refrescando cada ~30s, los polls concurrentes comparten un único
+        cálculo en lugar de repetir todas las agregaciones.
+
         Returns:
             Dict[str, Any]: Datos completos del dashboard nacional
         """
         try:
-            # Obtener datos de forma paralela (en implementación real usar asyncio.gather)
-            stats_comisarias = await self.comisaria_repo.get_estadisticas_resumen()
-            stats_contratos = await self.contrato_repo.get_estadisticas_financieras()
-            stats_avances = await self.partida_repo.get_estadisticas_avance()
-            comisarias_criticas = await self._get_comisarias_en_riesgo()
-            alertas_automaticas = await self.partida_repo.get_alertas_automaticas()
+            if self.dashboard_repo is not None:
+                # Rollup precalculado en la base: un SELECT trae todos los
+                # agregados; solo quedan las dos consultas top-N que
+                # devuelven filas
+                (
+                    bundle,
+                    comisarias_criticas,
+                    alertas_inmediatas,
+                ) = await asyncio.gather(
+                    self.dashboard_repo.get_ejecutivo_bundle(),
+                    self._get_comisarias_en_riesgo(),
+                    self.partida_repo.get_alertas_inmediatas(10),
+                )
+                stats_comisarias = bundle["stats_comisarias"]
+                stats_contratos = bundle["stats_contratos"]
+                stats_avances = bundle["stats_avances"]
+                contratos_counts = bundle["contratos_counts"]
+                alertas_criticas_count = bundle["alertas_criticas_count"]
+            else:
+                # Sin rollup disponible: obtener todos los datos
+                # independientes en paralelo; la latencia pasa de
+                # sum(t_i) a max(t_i) en este camino I/O-bound
+                (
+                    stats_comisarias,
+                    stats_contratos,
+                    stats_avances,
+                    comisarias_criticas,
+                    alertas_inmediatas,
+                    alertas_criticas_count,
+                    contratos_counts,
+                ) = await asyncio.gather(
+                    self.comisaria_repo.get_estadisticas_resumen(),
+                    self.contrato_repo.get_estadisticas_financieras(),
+                    self.partida_repo.get_estadisticas_avance(),
+                    self._get_comisarias_en_riesgo(),
+                    self.partida_repo.get_alertas_inmediatas(10),
+                    self.partida_repo.count_alertas_criticas(),
+                    self.contrato_repo.get_contratos_counts(30),
+                )
 
-            # Calcular métricas clave
-            dias_proyecto = await self._calcular_dias_proyecto()
-            performance_general = await self._calcular_performance_general()
+            # Métricas calculadas en memoria (sin I/O, no necesitan el gather)
+            # Un solo datetime.now() por request: timestamp y métricas
+            # temporales comparten el mismo instante
+            ahora = datetime.now()
+            dias_proyecto = self._calcular_dias_proyecto(ahora)
+            performance_general = self._calcular_performance_general()
 
             dashboard = {
-                "timestamp": datetime.now().isoformat(),
-                "resumen_ejecutivo": {
-                    "total_comisarias": stats_comisarias.get("total", 0),
-                    "comisarias_completadas": stats_comisarias.get("completadas", 0),
-                    "comisarias_en_proceso": stats_comisarias.get("en_proceso", 0),
-                    "comisarias_pendientes": stats_comisarias.get("pendientes", 0),
-                    "dias_transcurridos": dias_proyecto.get("transcurridos", 0),
-                    "dias_restantes": dias_proyecto.get("restantes", 0),
-                    "porcentaje_tiempo_transcurrido": dias_proyecto.get("porcentaje", 0),
-                    "presupuesto_total": stats_contratos.get("monto_total_contratos", 0),
-                    "presupuesto_ejecutado": stats_contratos.get("monto_completado", 0),
-                    "porcentaje_ejecucion_financiera": performance_general.get("ejecucion_financiera", 0)
-                },
+                "timestamp": ahora.isoformat(),
+                # dias_proyecto y performance_general los construye este
+                # mismo servicio con claves garantizadas: indexación directa
+                "resumen_ejecutivo": ResumenEjecutivo(
+                    stats_comisarias.get("total", 0),
+                    stats_comisarias.get("completadas", 0),
+                    stats_comisarias.get("en_proceso", 0),
+                    stats_comisarias.get("pendientes", 0),
+                    dias_proyecto["transcurridos"],
+                    dias_proyecto["restantes"],
+                    dias_proyecto["porcentaje"],
+                    stats_contratos.get("monto_total_contratos", 0),
+                    stats_contratos.get("monto_completado", 0),
+                    performance_general["ejecucion_financiera"],
+                ),
                 "comisarias_criticas": comisarias_criticas,
-                "alertas_inmediatas": [
-                    alerta for alerta in alertas_automaticas
-                    if alerta.get("requiere_accion_inmediata", False)
-                ][:10],  # Top 10 más críticas
-                "metricas_avance": {
-                    "avance_promedio_nacional": stats_avances.get("avance_promedio_fisico", 0),
-                    "avance_programado_nacional": stats_avances.get("avance_promedio_programado", 0),
-                    "diferencia_nacional": stats_avances.get("diferencia_promedio", 0),
-                    "partidas_criticas_total": stats_avances.get("partidas_criticas", 0),
-                    "total_partidas": stats_avances.get("total_partidas", 0)
-                },
-                "performance_contratos": {
-                    "contratos_activos": len(await self.contrato_repo.get_contratos_activos()),
-                    "contratos_vencidos": len(await self.contrato_repo.list_vencidos()),
-                    "contratos_por_vencer": len(await self.contrato_repo.list_por_vencer(30)),
-                    "performance_promedio": performance_general.get("performance_promedio", 0)
-                },
-                "recomendaciones_automaticas": await self._generar_recomendaciones_automaticas(
-                    comisarias_criticas, alertas_automaticas
+                # Top 10 más críticas: filtro y LIMIT ya aplicados en SQL
+                "alertas_inmediatas": alertas_inmediatas,
+                "metricas_avance": MetricasAvance(
+                    stats_avances.get("avance_promedio_fisico", 0),
+                    stats_avances.get("avance_promedio_programado", 0),
+                    stats_avances.get("diferencia_promedio", 0),
+                    stats_avances.get("partidas_criticas", 0),
+                    stats_avances.get("total_partidas", 0),
+                ),
+                "performance_contratos": PerformanceContratos(
+                    contratos_counts.get("activos", 0),
+                    contratos_counts.get("vencidos", 0),
+                    contratos_counts.get("por_vencer", 0),
+                    performance_general["performance_promedio"],
+                ),
+                "recomendaciones_automaticas": self._generar_recomendaciones_automaticas(
+                    comisarias_criticas, alertas_criticas_count
                 )
             }
 
@@ -117,11 +297,9 @@ class DashboardService:
 
         comisaria_ids = [c.id for c in comisarias_region]
 
-        # Estadísticas regionales
-        stats_region = {}
-        for comisaria_id in comisaria_ids:
-            stats = await self.partida_repo.get_estadisticas_avance(comisaria_id)
-            # Agregar lógica de agregación regional
+        # Estadísticas regionales: una sola consulta agrupada en lugar
+        # de un round trip por comisaría (N+1)
+        stats_region = await self.partida_repo.get_estadisticas_avance_bulk(comisaria_ids)
 
         return {
             "departamento": departamento,
@@ -156,79 +334,147 @@ class DashboardService:
             "estadisticas_avance": stats_partidas,
             "partidas_criticas": [p.to_dict() for p in partidas_criticas],
             "contratos": [c.to_dict() for c in contratos_comisaria],
-            "alertas_especificas": await self._generar_alertas_comisaria(comisaria_id),
-            "cronograma": await self._generar_cronograma_comisaria(comisaria_id)
+            "alertas_especificas": self._generar_alertas_comisaria(comisaria_id),
+            "cronograma": self._generar_cronograma_comisaria(comisaria_id)
         }
 
+    @_async_ttl_cache(ttl=15.0)
     async def _get_comisarias_en_riesgo(self, limite: int = 10) -> List[Dict[str, Any]]:
         """Obtener comisarías en mayor riesgo según múltiples criterios"""
         try:
             # Obtener resumen por comisaría
             resumen_comisarias = await self.partida_repo.get_resumen_por_comisaria()
 
-            comisarias_riesgo = []
-            for comisaria_id, datos in resumen_comisarias.items():
-                # Calcular score de riesgo
-                score_riesgo = await self._calcular_score_riesgo(datos)
-
-                if score_riesgo > 5.0:  # Umbral de riesgo
-                    comisaria = await self.comisaria_repo.get_by_id(comisaria_id)
-                    if comisaria:
-                        comisarias_riesgo.append({
-                            **datos,
-                            "comisaria_info": comisaria.to_dict(),
-                            "score_riesgo": score_riesgo,
-                            "nivel_riesgo": self._determinar_nivel_riesgo(score_riesgo),
-                            "acciones_recomendadas": await self._generar_acciones_riesgo(
-                                comisaria_id, score_riesgo
-                            )
-                        })
-
-            # Ordenar por score de riesgo descendente
-            comisarias_riesgo.sort(key=lambda x: x["score_riesgo"], reverse=True)
-            return comisarias_riesgo[:limite]
+            # 1. Calcular todos los scores de una vez (vectorizado) y filtrar
+            ids = list(resumen_comisarias.keys())
+            datos_list = list(resumen_comisarias.values())
+            scores = self._calcular_scores_riesgo(datos_list)
+
+            en_riesgo = [
+                (comisaria_id, datos, float(score))
+                for comisaria_id, datos, score in zip(ids, datos_list, scores)
+                if score > 5.0  # Umbral de riesgo
+            ]
+
+            if not en_riesgo:
+                return []
+
+            # 2. Traer todas las comisarías en riesgo en una sola consulta
+            # en lugar de un get_by_id por entrada (N+1)
+            comisarias_map = await self.comisaria_repo.get_by_ids(
+                [comisaria_id for comisaria_id, _, _ in en_riesgo]
+            )
+
+            # 3. Armar resultados en memoria
+            comisarias_riesgo = [
+                {
+                    **datos,
+                    "comisaria_info": comisarias_map[comisaria_id].to_dict(),
+                    "score_riesgo": score_riesgo,
+                    "nivel_riesgo": self._determinar_nivel_riesgo(score_riesgo),
+                    "acciones_recomendadas": self._generar_acciones_riesgo(
+                        comisaria_id, score_riesgo
+                    )
+                }
+                for comisaria_id, datos, score_riesgo in en_riesgo
+                if comisaria_id in comisarias_map
+            ]
+
+            # Top-k por score de riesgo: O(N log k) en lugar de ordenar
+            # la lista completa para quedarse con 10
+            return heapq.nlargest(
+                limite, comisarias_riesgo, key=lambda x: x["score_riesgo"]
+            )
 
         except Exception as e:
             logger.error(f"Error obteniendo comisarías en riesgo: {e}")
             return []
 
-    async def _calcular_score_riesgo(self, datos_comisaria: Dict[str, Any]) -> float:
+    def _calcular_score_riesgo(self, datos_comisaria: Dict[str, Any]) -> float:
         """
-        Calcular score de riesgo basado en múltiples factores.
+        Calcular score de riesgo de una comisaría (puro, sin I/O).
+
+        Para calcular sobre todas las comisarías a la vez usar
+        _calcular_scores_riesgo, que vectoriza el mismo cálculo.
+        """
+        return float(self._calcular_scores_riesgo([datos_comisaria])[0])
+
+    def _calcular_scores_riesgo(self, datos_comisarias: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Calcular scores de riesgo de todas las comisarías en un solo paso.
 
         Factores considerados:
         - Diferencia de avance promedio (peso: 40%)
         - Número de partidas críticas (peso: 30%)
         - Tiempo sin reportes (peso: 20%)
         - Estado de contratos (peso: 10%)
+
+        Args:
+            datos_comisarias: Resúmenes por comisaría
+
+        Returns:
+            np.ndarray: Score (0-10) por cada entrada, en el mismo orden
         """
-        score = 0.0
-
-        # Factor 1: Diferencia de avance (0-10 puntos)
-        diferencia_promedio = abs(datos_comisaria.get("diferencia_promedio", 0))
-        score += min(diferencia_promedio * 0.8, 10.0) * 0.4
-
-        # Factor 2: Partidas críticas (0-10 puntos)
-        total_partidas = datos_comisaria.get("total_partidas", 1)
-        partidas_criticas = datos_comisaria.get("partidas_criticas", 0)
-        porcentaje_criticas = (partidas_criticas / total_partidas) * 100
-        score += min(porcentaje_criticas * 0.5, 10.0) * 0.3
-
-        # Factor 3: Tiempo sin reportes (0-10 puntos)
-        ultimo_reporte = datos_comisaria.get("ultimo_reporte")
-        if ultimo_reporte:
-            try:
-                fecha_ultimo = datetime.fromisoformat(ultimo_reporte.replace('Z', '+00:00'))
-                dias_sin_reporte = (datetime.now() - fecha_ultimo).days
-                score += min(dias_sin_reporte * 0.5, 10.0) * 0.2
-            except:
-                score += 5.0 * 0.2  # Penalidad por fecha inválida
-
-        # Factor 4: Estado de contratos (0-10 puntos)
+        n = len(datos_comisarias)
+        if n == 0:
+            return np.empty(0)
+
+        # Arrays SoA llenados en una sola pasada sobre los resúmenes:
+        # un acceso al dict por campo y por fila (get ligado a local),
+        # en lugar de una barrida de generador por cada campo
+        diferencias = np.empty(n, dtype=np.float64)
+        totales = np.empty(n, dtype=np.float64)
+        criticas = np.empty(n, dtype=np.float64)
+        sin_reporte = np.empty(n, dtype=bool)
+        reportes = []
+        for i, datos in enumerate(datos_comisarias):
+            get = datos.get
+            diferencias[i] = abs(get("diferencia_promedio", 0) or 0)
+            totales[i] = get("total_partidas", 1) or 1
+            criticas[i] = get("partidas_criticas", 0) or 0
+            ultimo_reporte = get("ultimo_reporte")
+            sin_reporte[i] = not ultimo_reporte
+            # Días sin reporte: parseo vectorizado con datetime64 en
+            # lugar de N datetime.fromisoformat + N objetos timedelta
+            reportes.append((ultimo_reporte or "NaT").replace("Z", ""))
+        try:
+            fechas = np.array(reportes, dtype="datetime64[s]")
+        except ValueError:
+            # Alguna fecha malformada en el lote: degradar a conversión
+            # elemento por elemento marcando las inválidas como NaT
+            fechas = np.array(
+                [_a_datetime64(reporte) for reporte in reportes],
+                dtype="datetime64[s]"
+            )
+
+        ahora_np = np.datetime64(datetime.now(), "s")
+        # NaT produce NaN al dividir: marca fecha inválida (penalidad fija);
+        # 0 equivale a sin reporte
+        dias_sin_reporte = np.where(
+            sin_reporte,
+            0.0,
+            (ahora_np - fechas) / np.timedelta64(1, "D")
+        )
+        dias_sin_reporte = np.floor(dias_sin_reporte)
+
+        # Factor 1: Diferencia de avance (0-10 puntos, peso 40%)
+        score = np.minimum(diferencias * 0.8, 10.0) * 0.4
+
+        # Factor 2: Partidas críticas (0-10 puntos, peso 30%)
+        porcentaje_criticas = (criticas / np.maximum(totales, 1.0)) * 100
+        score += np.minimum(porcentaje_criticas * 0.5, 10.0) * 0.3
+
+        # Factor 3: Tiempo sin reportes (0-10 puntos, peso 20%)
+        score += np.where(
+            np.isnan(dias_sin_reporte),
+            5.0,  # Penalidad por fecha inválida
+            np.minimum(dias_sin_reporte * 0.5, 10.0)
+        ) * 0.2
+
+        # Factor 4: Estado de contratos (0-10 puntos, peso 10%)
         # Este factor se calculará cuando tengamos la integración completa
-        score += 0.0 * 0.1
 
-        return min(score, 10.0)
+        return np.minimum(score, 10.0)
 
     def _determinar_nivel_riesgo(self, score: float) -> str:
         """Determinar nivel de riesgo basado en el score"""
@@ -241,12 +487,12 @@ class DashboardService:
         else:
             return "bajo"
 
-    async def _generar_acciones_riesgo(
+    def _generar_acciones_riesgo(
         self,
         comisaria_id: int,
         score_riesgo: float
     ) -> List[str]:
-        """Generar acciones recomendadas según el nivel de riesgo"""
+        """Generar acciones recomendadas según el nivel de riesgo (puro, sin I/O)"""
         acciones = []
 
         if score_riesgo >= 8.0:
@@ -272,43 +518,34 @@ class DashboardService:
 
         return acciones
 
-    async def _calcular_dias_proyecto(self) -> Dict[str, Any]:
-        """Calcular métricas temporales del proyecto nacional"""
-        # En un proyecto real, estas fechas vendrían de configuración
-        fecha_inicio_proyecto = datetime(2026, 1, 1)  # Ejemplo
-        fecha_limite_proyecto = datetime(2026, 4, 30)  # 4 meses máximo
-
-        ahora = datetime.now()
-        dias_transcurridos = (ahora - fecha_inicio_proyecto).days
-        dias_totales = (fecha_limite_proyecto - fecha_inicio_proyecto).days
-        dias_restantes = max(0, (fecha_limite_proyecto - ahora).days)
+    def _calcular_dias_proyecto(self, ahora: datetime) -> Dict[str, Any]:
+        """Calcular métricas temporales del proyecto nacional (puro, sin I/O)"""
+        dias_transcurridos = (ahora - _FECHA_INICIO_PROYECTO).days
+        dias_restantes = max(0, (_FECHA_LIMITE_PROYECTO - ahora).days)
 
-        porcentaje = (dias_transcurridos / dias_totales) * 100 if dias_totales > 0 else 0
+        porcentaje = (
+            (dias_transcurridos / _DIAS_TOTALES_PROYECTO) * 100
+            if _DIAS_TOTALES_PROYECTO > 0 else 0
+        )
 
         return {
             "transcurridos": dias_transcurridos,
             "restantes": dias_restantes,
-            "totales": dias_totales,
+            "totales": _DIAS_TOTALES_PROYECTO,
             "porcentaje": round(porcentaje, 1),
-            "fecha_inicio": fecha_inicio_proyecto.isoformat(),
-            "fecha_limite": fecha_limite_proyecto.isoformat(),
+            "fecha_inicio": _FECHA_INICIO_PROYECTO.isoformat(),
+            "fecha_limite": _FECHA_LIMITE_PROYECTO.isoformat(),
             "en_tiempo": dias_restantes > 0
         }
 
-    async def _calcular_performance_general(self) -> Dict[str, Any]:
-        """Calcular métricas de performance general"""
-        # Placeholder para cálculos de performance
-        return {
-            "performance_promedio": 75.5,
-            "ejecucion_financiera": 68.2,
-            "cumplimiento_cronograma": 82.1,
-            "calidad_reportes": 90.3
-        }
+    def _calcular_performance_general(self) -> Dict[str, Any]:
+        """Calcular métricas de performance general (cacheado por minuto)"""
+        return _performance_general_cached(int(time.monotonic() // 60))
 
-    async def _generar_recomendaciones_automaticas(
+    def _generar_recomendaciones_automaticas(
         self,
         comisarias_criticas: List[Dict[str, Any]],
-        alertas: List[Dict[str, Any]]
+        alertas_criticas_count: int
     ) -> List[Dict[str, Any]]:
         """Generar recomendaciones automáticas para el dashboard"""
         recomendaciones = []
@@ -323,25 +560,24 @@ class DashboardService:
                 "accion_sugerida": "reunion_gerencia"
             })
 
-        # Recomendaciones basadas en alertas
-        alertas_criticas = [a for a in alertas if a.get("nivel") == "critica"]
-        if len(alertas_criticas) > 10:
+        # Recomendaciones basadas en alertas (conteo hecho en SQL)
+        if alertas_criticas_count > 10:
             recomendaciones.append({
                 "tipo": "rescision_contratos",
                 "prioridad": "critica",
-                "mensaje": f"Se detectaron {len(alertas_criticas)} partidas críticas. "
+                "mensaje": f"Se detectaron {alertas_criticas_count} partidas críticas. "
                           "Evaluar rescisión de contratos problemáticos.",
                 "accion_sugerida": "evaluacion_rescision"
             })
 
         return recomendaciones
 
-    async def _generar_alertas_comisaria(self, comisaria_id: int) -> List[Dict[str, Any]]:
+    def _generar_alertas_comisaria(self, comisaria_id: int) -> List[Dict[str, Any]]:
         """Generar alertas específicas para una comisaría"""
         # Implementar lógica específica de alertas por comisaría
         return []
 
-    async def _generar_cronograma_comisaria(self, comisaria_id: int) -> Dict[str, Any]:
+    def _generar_cronograma_comisaria(self, comisaria_id: int) -> Dict[str, Any]:
         """Generar cronograma específico de una comisaría"""
         # Implementar lógica de cronograma por comisaría
         return {}
\ No newline at end of file
@@ -5,10 +5,15 @@ Core del sistema para actualización por monitores regionales.
 """
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from decimal import Decimal
+import asyncio
+import os
+import numpy as np
 import pandas as pd
-from pathlib import Path
+import xlsxwriter
 import logging
 
+from app.core.config import settings
 from app.domain.entities.partida import Partida, TipoPartida, AvancePartida
 from app.domain.entities.comisaria import Comisaria
 from app.domain.repositories.partida_repository import PartidaRepository
@@ -16,6 +21,28 @@ from app.domain.repositories.comisaria_repository import ComisariaRepository
 
 logger = logging.getLogger(__name__)
 
+# Lector XLSX: calamine (Rust) parsea varias veces más rápido y con mucha
+# menos memoria que openpyxl; si no está instalado, pandas usa openpyxl
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE: Optional[str] = "calamine"
+except ImportError:
+    _EXCEL_ENGINE = None
+
+
+# Columnas requeridas por formato, como frozensets de módulo: sin
+# reconstruir los sets en cada validación
+_COLUMNAS_INICIAL = frozenset(
+    ["NID", "COMISARIA", "COD", "PARTIDA", "UNI", "METRADO", "PU", "PARCIAL"]
+)
+_COLUMNAS_AVANCE = frozenset(["NID", "AVANCE_PROGRAMADO", "AVANCE_FISICO"])
+
+# Los montos viajan por el pipeline de ingesta como enteros escalados
+# (int64, 4 decimales implícitos): el escalado/redondeo es vectorizado
+# y recién se ensancha a Decimal al construir la entidad, que es donde
+# el dominio lo exige
+_ESCALA_MONTOS = 10000
+
 
 class ExcelImportError(Exception):
     """Excepción específica para errores de importación Excel"""
@@ -79,8 +106,9 @@ class ExcelImportService:
         }
 
         try:
-            # 1. Validar archivo
-            if not Path(excel_path).exists():
+            # 1. Validar archivo (os.path: un stat directo, sin
+            # construir objetos Path en el camino caliente)
+            if not os.path.isfile(excel_path):
                 raise ExcelImportError(f"Archivo no encontrado: {excel_path}")
 
             # 2. Obtener comisaría
@@ -88,36 +116,18 @@ class ExcelImportService:
             if not comisaria:
                 raise ExcelValidationError(f"Comisaría no encontrada: {comisaria_codigo}")
 
-            # 3. Leer Excel
-            df = pd.read_excel(excel_path)
-            resultado["total_filas_excel"] = len(df)
-
-            # 4. Validar estructura del Excel
-            columnas_requeridas = ["NID", "COMISARIA", "COD", "PARTIDA", "UNI", "METRADO", "PU", "PARCIAL"]
-            self._validar_columnas_excel(df, columnas_requeridas)
-
-            # 5. Filtrar por comisaría
-            df_comisaria = df[df["COMISARIA"] == comisaria.nombre].copy()
-            if df_comisaria.empty:
-                raise ExcelValidationError(f"No se encontraron partidas para comisaría: {comisaria.nombre}")
-
-            # 6. Procesar partidas
-            partidas_creadas = []
-            errores_fila = []
-
-            for index, row in df_comisaria.iterrows():
-                try:
-                    partida = await self._crear_partida_desde_excel_row(row, comisaria.id)
-                    partidas_creadas.append(partida)
-                except Exception as e:
-                    errores_fila.append({
-                        "fila": index + 1,
-                        "nid": row.get("NID"),
-                        "codigo": row.get("COD"),
-                        "error": str(e)
-                    })
+            # 3. Parsear y construir entidades fuera del event loop:
+            # pd.read_excel y el armado de partidas son CPU-bound y
+            # bloquearían el resto de los requests del worker
+            (
+                resultado["total_filas_excel"],
+                partidas_creadas,
+                errores_fila,
+            ) = await asyncio.to_thread(
+                self._parse_partidas_excel, excel_path, comisaria
+            )
 
-            # 7. Guardar en lote
+            # 4. Guardar en lote
             if partidas_creadas:
                 partidas_guardadas = await self.partida_repo.bulk_create(partidas_creadas)
                 resultado["partidas_creadas"] = len(partidas_guardadas)
@@ -179,68 +189,73 @@ class ExcelImportService:
 
         try:
             # 1. Validaciones iniciales
-            if not Path(excel_path).exists():
+            if not os.path.isfile(excel_path):
                 raise ExcelImportError(f"Archivo no encontrado: {excel_path}")
 
             comisaria = await self.comisaria_repo.get_by_codigo(comisaria_codigo)
             if not comisaria:
                 raise ExcelValidationError(f"Comisaría no encontrada: {comisaria_codigo}")
 
-            # 2. Leer Excel de avances
-            df = pd.read_excel(excel_path)
-            columnas_avance = ["NID", "AVANCE_PROGRAMADO", "AVANCE_FISICO"]
-            self._validar_columnas_excel(df, columnas_avance)
+            # 2. Leer y validar el Excel fuera del event loop (CPU-bound)
+            df_validas, errores_parseo = await asyncio.to_thread(
+                self._parse_avances_excel, excel_path
+            )
+            resultado["errores"].extend(errores_parseo)
+
+            # 3b. Traer todas las partidas referenciadas en una sola
+            # consulta en lugar de un round trip por fila (N+1)
+            partidas_map = await self.partida_repo.get_by_nids(
+                df_validas["NID"].unique().tolist(), comisaria.id
+            )
 
-            # 3. Procesar cada avance
+            # 3c. Armar avances y críticas (filas ya validadas).
+            # to_dict(records) materializa dicts planos de una sola vez
+            # (sin construir una Series por fila como iterrows) y da
+            # semántica .get() para OBSERVACIONES, que puede faltar como
+            # columna o venir NaN en filas sueltas
             avances_data = []
             criticas_detectadas = []
 
-            for index, row in df.iterrows():
+            registros = df_validas.to_dict(orient="records")
+            for fila_idx, rec in zip(df_validas.index, registros):
                 try:
-                    # Validar datos de la fila
-                    nid = int(row["NID"])
-                    avance_programado = float(row["AVANCE_PROGRAMADO"])
-                    avance_fisico = float(row["AVANCE_FISICO"])
-
-                    # Validar rangos
-                    if not (0 <= avance_programado <= 100):
-                        raise ValueError(f"Avance programado fuera de rango: {avance_programado}")
-                    if not (0 <= avance_fisico <= 100):
-                        raise ValueError(f"Avance físico fuera de rango: {avance_fisico}")
-
-                    # Buscar partida
-                    partida = await self.partida_repo.get_by_nid_and_comisaria(nid, comisaria.id)
+                    nid = int(rec["NID"])
+
+                    partida = partidas_map.get(nid)
                     if not partida:
                         resultado["advertencias"].append(f"Partida NID {nid} no encontrada")
                         continue
 
+                    observaciones = rec.get("OBSERVACIONES", observaciones_generales)
+                    if observaciones != observaciones:  # NaN en la celda
+                        observaciones = observaciones_generales
+
                     # Crear datos de avance
                     avance_data = {
                         "partida_id": partida.id,
-                        "avance_programado": avance_programado,
-                        "avance_fisico": avance_fisico,
-                        "observaciones": row.get("OBSERVACIONES", observaciones_generales),
+                        "avance_programado": rec["AVANCE_PROGRAMADO"],
+                        "avance_fisico": rec["AVANCE_FISICO"],
+                        "observaciones": observaciones,
                         "monitor_responsable": monitor_responsable,
                         "fuente_datos": "excel"
                     }
                     avances_data.append(avance_data)
 
-                    # Detectar partidas críticas
-                    diferencia = avance_fisico - avance_programado
-                    if abs(diferencia) > 5.0:
+                    # Partidas críticas: máscara ya calculada en vector
+                    if rec["es_critica"]:
                         criticas_detectadas.append({
                             "nid": nid,
                             "codigo": partida.codigo,
                             "descripcion": partida.descripcion,
-                            "diferencia": diferencia,
-                            "avance_programado": avance_programado,
-                            "avance_fisico": avance_fisico
+                            "diferencia": rec["diferencia"],
+                            "avance_programado": rec["AVANCE_PROGRAMADO"],
+                            "avance_fisico": rec["AVANCE_FISICO"]
                         })
 
                 except Exception as e:
                     resultado["errores"].append({
-                        "fila": index + 1,
-                        "nid": row.get("NID"),
+                        "fila": fila_idx + 1,
+                        "nid": rec.get("NID"),
                         "error": str(e)
                     })
 
@@ -301,80 +316,235 @@ class ExcelImportService:
         else:
             partidas = await self.partida_repo.list_by_comisaria(comisaria_id=comisaria.id)
 
-        # Crear DataFrame para plantilla
-        datos_plantilla = []
-        for partida in partidas:
-            ultimo_avance = partida.get_ultimo_avance()
-            datos_plantilla.append({
-                "NID": partida.nid,
-                "CODIGO": partida.codigo,
-                "DESCRIPCION": partida.descripcion,
-                "UNIDAD": partida.unidad,
-                "METRADO": float(partida.metrado),
-                "AVANCE_ANTERIOR": ultimo_avance.avance_fisico if ultimo_avance else 0.0,
-                "AVANCE_PROGRAMADO": "",  # Para llenar
-                "AVANCE_FISICO": "",      # Para llenar
-                "OBSERVACIONES": ""       # Para llenar
-            })
-
-        df = pd.DataFrame(datos_plantilla)
-
         # Generar archivo
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"plantilla_avances_{comisaria_codigo}_{timestamp}.xlsx"
-        filepath = f"uploads/{filename}"
+        # El directorio de uploads se crea una sola vez en el startup
+        # de la aplicación (lifespan), no en cada generación
+        filepath = os.path.join(settings.UPLOAD_DIR, filename)
+
+        # Escribir en streaming, sin DataFrame intermedio:
+        # constant_memory descarta cada fila apenas se escribe en vez de
+        # retener todo el workbook como objetos Python en RAM
+        workbook = xlsxwriter.Workbook(filepath, {
+            "constant_memory": True,
+            "strings_to_numbers": False,
+        })
+        try:
+            worksheet = workbook.add_worksheet("Avances")
+
+            # Formato para campos obligatorios: en constant_memory los
+            # formatos de columna deben fijarse antes de escribir filas
+            fill_format = workbook.add_format({"bg_color": "#FFEB9C"})
+            worksheet.set_column("G:I", 15, fill_format)  # Columnas a llenar
+
+            worksheet.write_row(0, 0, [
+                "NID", "CODIGO", "DESCRIPCION", "UNIDAD", "METRADO",
+                "AVANCE_ANTERIOR", "AVANCE_PROGRAMADO", "AVANCE_FISICO",
+                "OBSERVACIONES"
+            ])
+
+            for i, partida in enumerate(partidas, start=1):
+                ultimo_avance = partida.get_ultimo_avance()
+                worksheet.write_row(i, 0, [
+                    partida.nid,
+                    partida.codigo,
+                    partida.descripcion,
+                    partida.unidad,
+                    float(partida.metrado),
+                    ultimo_avance.avance_fisico if ultimo_avance else 0.0,
+                    "",  # AVANCE_PROGRAMADO: para llenar
+                    "",  # AVANCE_FISICO: para llenar
+                    ""   # OBSERVACIONES: para llenar
+                ])
+        finally:
+            workbook.close()
+
+        logger.info(f"Plantilla generada: {filepath}")
+        return filepath
+
+    def _parse_partidas_excel(
+        self,
+        excel_path: str,
+        comisaria: Comisaria
+    ) -> Tuple[int, List[Partida], List[Dict[str, Any]]]:
+        """
+        Parsear el Excel inicial y construir las entidades Partida.
 
-        # Crear directorio si no existe
-        Path("uploads").mkdir(exist_ok=True)
+        Síncrono y CPU-bound a propósito: se invoca vía asyncio.to_thread
+        para no bloquear el event loop durante la lectura del archivo y
+        el armado de miles de entidades.
 
-        # Guardar con formato
-        with pd.ExcelWriter(filepath, engine='xlsxwriter') as writer:
-            df.to_excel(writer, sheet_name='Avances', index=False)
+        Returns:
+            Tuple: (total filas del Excel, partidas construidas,
+            errores por fila)
+        """
+        df = pd.read_excel(excel_path, engine=_EXCEL_ENGINE)
+        total_filas = len(df)
+
+        # Validar estructura del Excel
+        self._validar_columnas_excel(df, _COLUMNAS_INICIAL)
+
+        # Filtrar por comisaría: con dtype category la comparación
+        # es sobre códigos enteros, no string por string; sin .copy()
+        # porque el resto del flujo solo itera el subconjunto
+        df["COMISARIA"] = df["COMISARIA"].astype("category")
+        df_comisaria = df.loc[df["COMISARIA"] == comisaria.nombre]
+        if df_comisaria.empty:
+            raise ExcelValidationError(f"No se encontraron partidas para comisaría: {comisaria.nombre}")
+
+        # Conversión monetaria vectorizada: escalado y redondeo de las
+        # tres columnas a int64 en pasadas C (sin un objeto Decimal por
+        # celda en esta etapa); los valores no numéricos se reportan
+        # como error de fila igual que antes
+        errores_fila = []
+        montos = {}
+        mal_total = pd.Series(False, index=df_comisaria.index)
+        for col in ("METRADO", "PU", "PARCIAL"):
+            num = pd.to_numeric(df_comisaria[col], errors="coerce")
+            mal_total |= num.isna() & df_comisaria[col].notna()
+            montos[col] = (
+                (num.fillna(0.0) * _ESCALA_MONTOS).round().astype("int64")
+            )
 
-            # Formato condicional para campos a llenar
-            workbook = writer.book
-            worksheet = writer.sheets['Avances']
+        for idx in df_comisaria.index[mal_total]:
+            errores_fila.append({
+                "fila": idx + 1,
+                "nid": df_comisaria.at[idx, "NID"],
+                "codigo": df_comisaria.at[idx, "COD"],
+                "error": "Valores no numéricos en METRADO/PU/PARCIAL"
+            })
 
-            # Formato para campos obligatorios
-            fill_format = workbook.add_format({'bg_color': '#FFEB9C'})
-            worksheet.set_column('G:I', 15, fill_format)  # Columnas a llenar
+        # Clasificación de tipo vectorizada: "código con punto" y
+        # "metrado en cero" se resuelven como arrays booleanos y un
+        # np.select de dos niveles; el loop por fila ya no hace split
+        # de strings por partida
+        tiene_punto = (
+            df_comisaria["COD"]
+            .astype("string")
+            .str.contains(".", regex=False)
+            .fillna(False)
+            .to_numpy()
+        )
+        metrado_cero = montos["METRADO"].eq(0).to_numpy()
+        tipos = np.where(
+            metrado_cero,
+            np.where(
+                tiene_punto,
+                TipoPartida.SUBTITULO.value,
+                TipoPartida.TITULO.value
+            ),
+            TipoPartida.PARTIDA.value
+        )
 
-        logger.info(f"Plantilla generada: {filepath}")
-        return filepath
+        df_comisaria = (
+            df_comisaria.assign(**montos, tipo_code=tipos).loc[~mal_total]
+        )
+
+        # Procesar partidas: itertuples evita construir una pd.Series
+        # por fila (iterrows); las namedtuples livianas dominan en
+        # reportes grandes
+        partidas_creadas = []
+        for row in df_comisaria.itertuples(index=True):
+            try:
+                partida = self._crear_partida_desde_excel_row(row, comisaria.id)
+                partidas_creadas.append(partida)
+            except Exception as e:
+                errores_fila.append({
+                    "fila": row.Index + 1,
+                    "nid": getattr(row, "NID", None),
+                    "codigo": getattr(row, "COD", None),
+                    "error": str(e)
+                })
+
+        return total_filas, partidas_creadas, errores_fila
+
+    def _parse_avances_excel(
+        self,
+        excel_path: str
+    ) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+        """
+        Leer y validar el Excel de avances (síncrono, para asyncio.to_thread).
+
+        Validación vectorizada: conversión de tipos, rangos y diferencia
+        en pasadas C sobre columnas completas, en lugar de int()/float()
+        y comparaciones por fila.
+
+        Returns:
+            Tuple: (DataFrame con filas válidas y columnas
+            diferencia/es_critica precalculadas, errores por fila)
+        """
+        df = pd.read_excel(excel_path, engine=_EXCEL_ENGINE)
+        self._validar_columnas_excel(df, _COLUMNAS_AVANCE)
+
+        nid_num = pd.to_numeric(df["NID"], errors="coerce")
+        prog = pd.to_numeric(df["AVANCE_PROGRAMADO"], errors="coerce")
+        fis = pd.to_numeric(df["AVANCE_FISICO"], errors="coerce")
+
+        no_numerico = nid_num.isna() | prog.isna() | fis.isna()
+        fuera_prog = prog.notna() & ~prog.between(0, 100)
+        fuera_fis = fis.notna() & ~fis.between(0, 100)
+        invalidas = no_numerico | fuera_prog | fuera_fis
+
+        errores_fila = []
+        for idx in df.index[invalidas]:
+            if no_numerico.at[idx]:
+                mensaje = "Valores no numéricos en NID o avances"
+            elif fuera_prog.at[idx]:
+                mensaje = f"Avance programado fuera de rango: {prog.at[idx]}"
+            else:
+                mensaje = f"Avance físico fuera de rango: {fis.at[idx]}"
+            errores_fila.append({
+                "fila": idx + 1,
+                "nid": df.at[idx, "NID"],
+                "error": mensaje
+            })
+
+        df_validas = pd.DataFrame({
+            "NID": nid_num[~invalidas].astype("int64"),
+            "AVANCE_PROGRAMADO": prog[~invalidas],
+            "AVANCE_FISICO": fis[~invalidas],
+        })
+        df_validas["diferencia"] = (
+            df_validas["AVANCE_FISICO"] - df_validas["AVANCE_PROGRAMADO"]
+        )
+        df_validas["es_critica"] = df_validas["diferencia"].abs() > 5.0
+        if "OBSERVACIONES" in df.columns:
+            df_validas["OBSERVACIONES"] = df["OBSERVACIONES"][~invalidas]
+
+        return df_validas, errores_fila
 
-    def _validar_columnas_excel(self, df: pd.DataFrame, columnas_requeridas: List[str]) -> None:
+    def _validar_columnas_excel(self, df: pd.DataFrame, columnas_requeridas: frozenset) -> None:
         """Validar que el Excel tenga las columnas requeridas"""
-        columnas_faltantes = set(columnas_requeridas) - set(df.columns)
+        columnas_faltantes = columnas_requeridas.difference(df.columns)
         if columnas_faltantes:
             raise ExcelValidationError(
-                f"Columnas faltantes en Excel: {', '.join(columnas_faltantes)}"
+                f"Columnas faltantes en Excel: {', '.join(sorted(columnas_faltantes))}"
             )
 
-    async def _crear_partida_desde_excel_row(self, row: pd.Series, comisaria_id: int) -> Partida:
-        """Crear entidad Partida desde fila de Excel"""
-        from decimal import Decimal
+    def _crear_partida_desde_excel_row(self, row: Any, comisaria_id: int) -> Partida:
+        """
+        Crear entidad Partida desde fila de Excel (namedtuple de itertuples).
 
-        # Determinar tipo de partida según el código
-        codigo = str(row["COD"]).strip()
-        if pd.isna(row["METRADO"]) or row["METRADO"] == 0:
-            if len(codigo.split('.')) == 1:
-                tipo = TipoPartida.TITULO
-            else:
-                tipo = TipoPartida.SUBTITULO
-        else:
-            tipo = TipoPartida.PARTIDA
+        Las columnas METRADO/PU/PARCIAL llegan como int64 escalado
+        (x10000, NaN mapeado a 0) por la conversión vectorizada previa;
+        aquí solo se ensanchan a Decimal, sin parseo ni aritmética float.
+        El tipo viene ya clasificado en la columna tipo_code.
+        """
+        codigo = str(row.COD).strip()
+        tipo = TipoPartida(row.tipo_code)
 
         # Crear partida
         partida = Partida(
             id=None,
-            nid=int(row["NID"]),
+            nid=int(row.NID),
             codigo=codigo,
-            descripcion=str(row["PARTIDA"]).strip(),
+            descripcion=str(row.PARTIDA).strip(),
             tipo=tipo,
-            unidad=str(row["UNI"]).strip() if pd.notna(row["UNI"]) else None,
-            metrado=Decimal(str(row["METRADO"])) if pd.notna(row["METRADO"]) else Decimal('0'),
-            precio_unitario=Decimal(str(row["PU"])) if pd.notna(row["PU"]) else Decimal('0'),
-            parcial=Decimal(str(row["PARCIAL"])) if pd.notna(row["PARCIAL"]) else Decimal('0'),
+            unidad=str(row.UNI).strip() if pd.notna(row.UNI) else None,
+            metrado=Decimal(int(row.METRADO)).scaleb(-4),
+            precio_unitario=Decimal(int(row.PU)).scaleb(-4),
+            parcial=Decimal(int(row.PARCIAL)).scaleb(-4),
             comisaria_id=comisaria_id
         )
 
@@ -387,35 +557,46 @@ class ExcelImportService:
         monitor_responsable: str
     ) -> List[Dict[str, Any]]:
         """Generar alertas para partidas críticas detectadas"""
-        alertas = []
-
-        for partida in partidas_criticas:
-            diferencia = partida["diferencia"]
-            nivel_alerta = "critica" if abs(diferencia) > 8 else "alta"
-
-            # Generar recomendación
-            if diferencia < -5:  # Retraso crítico
-                recomendacion = "Incrementar personal o turnos de trabajo"
-                if abs(diferencia) > 10:
-                    recomendacion = "Evaluar rescisión de contrato"
-            else:  # Adelanto excesivo
-                recomendacion = "Verificar calidad de ejecución"
-
-            alerta = {
+        if not partidas_criticas:
+            return []
+
+        # Clasificación y orden vectorizados: nivel y recomendación salen
+        # de np.where sobre el array de diferencias, y el orden final de
+        # np.argsort sobre |diferencia| precalculado — sin pagar un
+        # callback Python (lambda + abs) por cada comparación del sort
+        diffs = np.array(
+            [p["diferencia"] for p in partidas_criticas], dtype="float64"
+        )
+        abs_diffs = np.abs(diffs)
+        niveles = np.where(abs_diffs > 8, "critica", "alta").tolist()
+        recomendaciones = np.where(
+            diffs < -5,  # Retraso crítico
+            np.where(
+                abs_diffs > 10,
+                "Evaluar rescisión de contrato",
+                "Incrementar personal o turnos de trabajo"
+            ),
+            "Verificar calidad de ejecución"  # Adelanto excesivo
+        ).tolist()
+        accion_inmediata = (abs_diffs > 8).tolist()
+        orden = np.argsort(-abs_diffs, kind="stable")
+
+        fecha_deteccion = datetime.now().isoformat()
+        return [
+            {
                 "tipo": "partida_critica",
-                "nivel": nivel_alerta,
+                "nivel": niveles[i],
                 "comisaria": comisaria_codigo,
-                "nid": partida["nid"],
-                "codigo": partida["codigo"],
-                "descripcion": partida["descripcion"][:100],
-                "diferencia": diferencia,
-                "avance_programado": partida["avance_programado"],
-                "avance_fisico": partida["avance_fisico"],
+                "nid": partidas_criticas[i]["nid"],
+                "codigo": partidas_criticas[i]["codigo"],
+                "descripcion": partidas_criticas[i]["descripcion"][:100],
+                "diferencia": partidas_criticas[i]["diferencia"],
+                "avance_programado": partidas_criticas[i]["avance_programado"],
+                "avance_fisico": partidas_criticas[i]["avance_fisico"],
                 "monitor_responsable": monitor_responsable,
-                "recomendacion": recomendacion,
-                "fecha_deteccion": datetime.now().isoformat(),
-                "requiere_accion_inmediata": abs(diferencia) > 8
+                "recomendacion": recomendaciones[i],
+                "fecha_deteccion": fecha_deteccion,
+                "requiere_accion_inmediata": accion_inmediata[i]
             }
-            alertas.append(alerta)
-
-        return sorted(alertas, key=lambda x: abs(x["diferencia"]), reverse=True)
\ No newline at end of file
+            for i in orden
+        ]
\ No newline at end of file
@@ -3,6 +3,7 @@
 Configuración centralizada con Pydantic Settings.
 Siguiendo principios de 12-factor app.
 """
+from functools import lru_cache
 from typing import Optional, List
 from pydantic_settings import BaseSettings
 from pydantic import Field
@@ -238,17 +239,23 @@ class Settings(BaseSettings):
         """
 
 
-# 🌍 Global settings instance
-settings = Settings()
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Dependency para inyectar configuración en FastAPI.
 
+    Cacheada (patrón recomendado por Pydantic): parsear el .env tiene un
+    costo de IO/regex no trivial y así se paga una sola vez por proceso,
+    incluso cuando tests o scripts la invocan repetidamente. Para forzar
+    una relectura: get_settings.cache_clear().
+
     Usage:
         @app.get("/config")
         def get_config(config: Settings = Depends(get_settings)):
             return {"environment": config.ENVIRONMENT}
     """
-    return settings
\ No newline at end of file
+    return Settings()
+
+
+# 🌍 Global settings instance
+settings = get_settings()
\ No newline at end of file
@@ -3,9 +3,12 @@
 Configuración de base de datos con SQLAlchemy async.
 Pool de conexiones y session management.
 """
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 from sqlalchemy import MetaData
+from functools import lru_cache
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     create_async_engine,
     async_sessionmaker
@@ -35,29 +38,62 @@ class Base(DeclarativeBase):
     metadata = metadata
 
 
-# 🚀 Engine con configuración optimizada para producción
-# Configuración condicional según el tipo de BD
-engine_kwargs = {
-    "echo": settings.DEBUG,  # Log SQL en development
-}
+# 🚀 Engine con configuración optimizada para producción,
+# construido perezosamente: importar este módulo (p.ej. solo por Base)
+# ya no paga la creación del engine en cada worker
 
-# Solo agregar pool options para PostgreSQL
-if not settings.database_url.startswith("sqlite"):
-    engine_kwargs.update({
-        "pool_size": settings.DB_POOL_SIZE,
-        "max_overflow": settings.DB_MAX_OVERFLOW,
-        "pool_pre_ping": True,  # Verifica conexiones antes de usar
-        "pool_recycle": 3600,   # Recicla conexiones cada hora
-    })
-
-engine = create_async_engine(settings.database_url, **engine_kwargs)
-
-# 📦 Session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False
-)
+
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    """
+    Obtener el engine async del proceso (creado en el primer uso).
+
+    Configuración condicional según el tipo de BD.
+    """
+    engine_kwargs = {
+        "echo": settings.DEBUG,  # Log SQL en development
+        # Filas por INSERT multi-valores en los caminos bulk
+        # (insertmanyvalues de SQLAlchemy 2.0)
+        "insertmanyvalues_page_size": 1000,
+    }
+
+    # Solo agregar pool options para PostgreSQL
+    if not settings.database_url.startswith("sqlite"):
+        engine_kwargs.update({
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_pre_ping": True,  # Verifica conexiones antes de usar
+            "pool_recycle": 3600,   # Recicla conexiones cada hora
+            # LIFO: reusar las conexiones calientes mejora el hit rate
+            # del cache de planes bajo tráfico en ráfagas
+            "pool_use_lifo": True,
+        })
+
+    if settings.database_url.startswith("postgresql+asyncpg"):
+        engine_kwargs["connect_args"] = {
+            # Cache de statements preparados: evita re-parsear/re-planear
+            # las consultas calientes (lookups por NID, bulk updates)
+            "statement_cache_size": 1024,
+            "prepared_statement_cache_size": 1024,
+            "server_settings": {
+                # El JIT de PostgreSQL agrega 50-200ms de warmup a
+                # consultas analíticas chicas como las del dashboard
+                "jit": "off",
+                "application_name": "nemaec-erp",
+            },
+        }
+
+    return create_async_engine(settings.database_url, **engine_kwargs)
+
+
+@lru_cache(maxsize=1)
+def get_sessionmaker() -> async_sessionmaker:
+    """📦 Session factory del proceso (creada en el primer uso)"""
+    return async_sessionmaker(
+        get_engine(),
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -71,7 +107,7 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         # Usar db aquí
         pass
     """
-    async with AsyncSessionLocal() as session:
+    async with get_sessionmaker()() as session:
         try:
             yield session
             await session.commit()
@@ -82,6 +118,34 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@asynccontextmanager
+async def session_scope() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Unit of work con una sola sesión/conexión pinneada.
+
+    Para servicios que disparan varias consultas secuenciales (dashboard,
+    imports): construir todos los repositorios sobre esta misma sesión
+    evita que cada llamada haga checkout/checkin en el pool, que bajo
+    carga es la fuente principal de latencia de cola.
+
+    Nota: una AsyncSession no admite consultas concurrentes; las ramas
+    que paralelizan con asyncio.gather deben usar sesiones separadas
+    (una por task), no esta.
+
+    async with session_scope() as session:
+        repo_a = SqlAlchemyComisariaRepository(session)
+        repo_b = SqlAlchemyPartidaRepository(session)
+        ...
+    """
+    async with get_sessionmaker()() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
 async def init_db() -> None:
     """
     Inicializar base de datos.
@@ -89,7 +153,7 @@ async def init_db() -> None:
 
     Llamar en startup de la aplicación.
     """
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         # Importar todos los modelos para que estén disponibles
         from app.infrastructure.database.models import (  # noqa
             ComisariaModel,
@@ -105,4 +169,4 @@ async def close_db() -> None:
     Cerrar conexiones de base de datos.
     Llamar en shutdown de la aplicación.
     """
-    await engine.dispose()
\ No newline at end of file
+    await get_engine().dispose()
\ No newline at end of file
@@ -3,22 +3,86 @@
 Manejo de autenticación, autorización y encriptación.
 JWT tokens, password hashing, y utilidades de seguridad.
 """
-from datetime import datetime, timedelta
-from typing import Any, Union, Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import asyncio
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from datetime import timedelta
+from types import MappingProxyType
+from typing import Any, Mapping, Protocol, Union, Optional
+import bcrypt
+import jwt
 
 from app.core.config import settings
 
 
-# 🔒 Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+class PasswordHasher(Protocol):
+    """
+    Estrategia de hashing de contraseñas.
+
+    Los hashes se auto-identifican por prefijo ($2b$, $argon2id$, $y$),
+    así un backend nuevo puede convivir con hashes viejos: verify
+    acepta cualquier formato que el backend reconozca y hash produce el
+    formato del backend activo. Cambiar de algoritmo no toca los call
+    sites de get_password_hash / verify_password.
+    """
+
+    def hash(self, password: str) -> str: ...
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool: ...
+
+
+class BcryptHasher:
+    """Backend bcrypt vía el módulo C (formato $2b$, 12 rounds)"""
+
+    def hash(self, password: str) -> str:
+        return bcrypt.hashpw(
+            password.encode("utf-8"), bcrypt.gensalt()
+        ).decode("ascii")
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return bcrypt.checkpw(
+            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+        )
+
+
+# Backend activo del proceso. Cuando exista un backend memory-hard
+# (argon2-cffi / yescrypt), la selección pasa a leerse de settings
+_HASHER: PasswordHasher = BcryptHasher()
+
+# Cache de verificaciones bcrypt exitosas: bcrypt es deliberadamente
+# caro (~100ms) y domina la latencia de auth cuando un cliente se
+# re-autentica seguido con las mismas credenciales. La clave es
+# HMAC(SECRET_KEY, plain:hash), así el texto plano nunca queda en
+# memoria como clave del dict. Solo se cachean aciertos: cachear
+# fallos dejaría que intentos fallidos (controlados por un atacante)
+# inunden el cache y desalojen las entradas legítimas.
+_VERIFY_CACHE: dict[bytes, float] = {}
+_VERIFY_CACHE_TTL = 60.0
+_VERIFY_CACHE_MAX = 1024
+_VERIFY_CACHE_LOCK = threading.Lock()
+
+
+def _verify_cache_key(plain_password: str, hashed_password: str) -> bytes:
+    """Derivar clave de cache sin exponer el texto plano"""
+    return hmac.new(
+        settings.SECRET_KEY.encode(),
+        f"{plain_password}:{hashed_password}".encode(),
+        "sha256"
+    ).digest()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verificar contraseña plana contra hash.
 
+    Las verificaciones exitosas se cachean 60s (ver _VERIFY_CACHE):
+    los repeat-verifies de un mismo cliente saltan el key schedule
+    de Blowfish completo.
+
     Args:
         plain_password: Contraseña en texto plano
         hashed_password: Hash de contraseña almacenado
@@ -26,7 +90,22 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True si la contraseña coincide
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    clave = _verify_cache_key(plain_password, hashed_password)
+    ahora = time.monotonic()
+
+    with _VERIFY_CACHE_LOCK:
+        expiracion = _VERIFY_CACHE.get(clave)
+        if expiracion is not None and expiracion > ahora:
+            return True
+
+    if not _HASHER.verify(plain_password, hashed_password):
+        return False
+
+    with _VERIFY_CACHE_LOCK:
+        if len(_VERIFY_CACHE) >= _VERIFY_CACHE_MAX:
+            _VERIFY_CACHE.clear()
+        _VERIFY_CACHE[clave] = ahora + _VERIFY_CACHE_TTL
+    return True
 
 
 def get_password_hash(password: str) -> str:
@@ -37,9 +116,30 @@ def get_password_hash(password: str) -> str:
         password: Contraseña en texto plano
 
     Returns:
-        str: Hash de la contraseña
+        str: Hash de la contraseña (formato según el backend activo)
     """
-    return pwd_context.hash(password)
+    return _HASHER.hash(password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Variante async de verify_password para handlers FastAPI.
+
+    bcrypt bloquea ~100ms por verificación; ejecutado en línea dentro
+    de un handler async frena todos los requests del worker. Vía
+    asyncio.to_thread el event loop queda libre y, como el backend C de
+    bcrypt libera el GIL durante el key schedule, las verificaciones
+    concurrentes corren en paralelo de verdad. Pasa por
+    verify_password, así conserva el cache de aciertos.
+    """
+    return await asyncio.to_thread(
+        verify_password, plain_password, hashed_password
+    )
+
+
+async def aget_password_hash(password: str) -> str:
+    """Variante async de get_password_hash (ver averify_password)"""
+    return await asyncio.to_thread(get_password_hash, password)
 
 
 def create_access_token(
@@ -56,14 +156,15 @@ def create_access_token(
     Returns:
         str: Token JWT codificado
     """
+    # exp numérico con aritmética entera sobre time.time(): el claim
+    # tiene resolución de segundos de todos modos, y así no se
+    # construyen dos datetimes por token bajo ráfagas de login
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        duracion = int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
+        duracion = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {"exp": int(time.time()) + duracion, "sub": str(subject)}
     encoded_jwt = jwt.encode(
         to_encode,
         settings.SECRET_KEY,
@@ -72,16 +173,38 @@ def create_access_token(
     return encoded_jwt
 
 
+# Cache de tokens ya verificados: un SPA manda el mismo Bearer token en
+# cada request, y re-verificar firma + base64 + JSON por request es CPU
+# puro. La clave es blake2b(token) para no retener el token crudo; solo
+# se cachean decodificaciones exitosas y la entrada nunca sobrevive al
+# exp del propio token
+_TOKEN_CACHE: dict[bytes, tuple[float, str]] = {}
+_TOKEN_CACHE_TTL = 30.0
+_TOKEN_CACHE_MAX = 4096
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+
 def verify_token(token: str) -> Optional[str]:
     """
     Verificar y decodificar token JWT.
 
+    Los tokens válidos se cachean hasta 30s (acotado por su exp), así
+    los requests repetidos del mismo cliente no re-verifican la firma.
+
     Args:
         token: Token JWT a verificar
 
     Returns:
         Optional[str]: Subject del token si es válido, None si no
     """
+    clave = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    ahora = time.time()
+
+    with _TOKEN_CACHE_LOCK:
+        entrada = _TOKEN_CACHE.get(clave)
+        if entrada is not None and entrada[0] > ahora:
+            return entrada[1]
+
     try:
         payload = jwt.decode(
             token,
@@ -91,8 +214,19 @@ def verify_token(token: str) -> Optional[str]:
         user_id: str = payload.get("sub")
         if user_id is None:
             return None
+
+        expiracion = min(
+            ahora + _TOKEN_CACHE_TTL,
+            float(payload.get("exp", 0))
+        )
+        if expiracion > ahora:
+            with _TOKEN_CACHE_LOCK:
+                if len(_TOKEN_CACHE) >= _TOKEN_CACHE_MAX:
+                    _TOKEN_CACHE.clear()
+                _TOKEN_CACHE[clave] = (expiracion, user_id)
+
         return user_id
-    except JWTError:
+    except jwt.PyJWTError:
         return None
 
 
@@ -103,10 +237,56 @@ def generate_api_key() -> str:
     Returns:
         str: API key único
     """
-    import secrets
     return secrets.token_urlsafe(32)
 
 
+# Clasificación de caracteres para validate_password_strength: una
+# máscara de bits por clase y una tabla de 256 bytes precomputada, así
+# la contraseña se recorre una sola vez (bytes.translate en C) en lugar
+# de cinco generadores any(...) carácter por carácter
+_MAYUSCULA, _MINUSCULA, _DIGITO, _ESPECIAL = 1, 2, 4, 8
+_CARACTERES_ESPECIALES = "!@#$%^&*(),.?\":{}|<>"
+_TABLA_CLASES = bytes(
+    _MAYUSCULA if chr(i).isupper() else
+    _MINUSCULA if chr(i).islower() else
+    _DIGITO if chr(i).isdigit() else
+    _ESPECIAL if chr(i) in _CARACTERES_ESPECIALES else
+    0
+    for i in range(128)
+) + bytes(128)  # bytes no ASCII: sin clase en el camino rápido
+
+# Contraseñas comunes prohibidas: frozenset para lookup O(1)
+_CONTRASENAS_COMUNES = frozenset(
+    ["password", "123456", "qwerty", "admin", "nemaec", "policia"]
+)
+
+
+def _clases_de_caracteres(password: str) -> int:
+    """
+    Clasificar los caracteres de la contraseña en una sola pasada.
+
+    El camino ASCII es bytes.translate + set(): dos pasadas C y un OR
+    sobre a lo sumo cinco valores distintos. Los caracteres no ASCII
+    (poco frecuentes en contraseñas) se clasifican aparte con los
+    métodos Unicode de str, solo sobre los caracteres únicos.
+    """
+    flags = 0
+    datos = password.encode("utf-8")
+    for clase in set(datos.translate(_TABLA_CLASES)):
+        flags |= clase
+
+    if not datos.isascii():
+        for c in {c for c in password if ord(c) > 127}:
+            if c.isupper():
+                flags |= _MAYUSCULA
+            elif c.islower():
+                flags |= _MINUSCULA
+            elif c.isdigit():
+                flags |= _DIGITO
+
+    return flags
+
+
 def validate_password_strength(password: str) -> dict[str, Any]:
     """
     Validar fortaleza de contraseña según políticas institucionales.
@@ -130,32 +310,30 @@ def validate_password_strength(password: str) -> dict[str, Any]:
     else:
         result["score"] += 1
 
-    if not any(c.isupper() for c in password):
+    clases = _clases_de_caracteres(password)
+
+    if not clases & _MAYUSCULA:
         result["errors"].append("Debe contener al menos una mayúscula")
     else:
         result["score"] += 1
 
-    if not any(c.islower() for c in password):
+    if not clases & _MINUSCULA:
         result["errors"].append("Debe contener al menos una minúscula")
     else:
         result["score"] += 1
 
-    if not any(c.isdigit() for c in password):
+    if not clases & _DIGITO:
         result["errors"].append("Debe contener al menos un número")
     else:
         result["score"] += 1
 
-    special_chars = "!@#$%^&*(),.?\":{}|<>"
-    if not any(c in special_chars for c in password):
+    if not clases & _ESPECIAL:
         result["errors"].append("Debe contener al menos un carácter especial")
     else:
         result["score"] += 1
 
     # Contraseñas comunes prohibidas
-    common_passwords = [
-        "password", "123456", "qwerty", "admin", "nemaec", "policia"
-    ]
-    if password.lower() in common_passwords:
+    if password.lower() in _CONTRASENAS_COMUNES:
         result["errors"].append("Contraseña muy común, elige una más segura")
 
     result["is_valid"] = len(result["errors"]) == 0
@@ -171,36 +349,51 @@ def validate_password_strength(password: str) -> dict[str, Any]:
     return result
 
 
+# Los headers son estáticos: construidos una sola vez a nivel módulo y
+# expuestos como vista de solo lectura, en lugar de reasignar ~8 strings
+# por response en el middleware
+_SECURITY_HEADERS: MappingProxyType = MappingProxyType({
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    "Content-Security-Policy": (
+        "default-src 'self'; "
+        "script-src 'self' 'unsafe-inline'; "
+        "style-src 'self' 'unsafe-inline'; "
+        "img-src 'self' data:; "
+        "connect-src 'self'"
+    ),
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": (
+        "geolocation=(), microphone=(), camera=()"
+    )
+})
+
+
 class SecurityHeaders:
     """
     Headers de seguridad recomendados para producción.
     """
 
     @staticmethod
-    def get_security_headers() -> dict[str, str]:
+    def get_security_headers() -> Mapping[str, str]:
         """
         Obtener headers de seguridad estándar.
 
         Returns:
-            dict: Headers de seguridad
+            Mapping: Headers de seguridad (vista inmutable compartida,
+            no un dict nuevo por llamada)
         """
-        return {
-            "X-Content-Type-Options": "nosniff",
-            "X-Frame-Options": "DENY",
-            "X-XSS-Protection": "1; mode=block",
-            "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
-            "Content-Security-Policy": (
-                "default-src 'self'; "
-                "script-src 'self' 'unsafe-inline'; "
-                "style-src 'self' 'unsafe-inline'; "
-                "img-src 'self' data:; "
-                "connect-src 'self'"
-            ),
-            "Referrer-Policy": "strict-origin-when-cross-origin",
-            "Permissions-Policy": (
-                "geolocation=(), microphone=(), camera=()"
-            )
-        }
+        return _SECURITY_HEADERS
+
+
+# Tabla precompilada para sanitize_filename: caracteres peligrosos a
+# '_' y caracteres de control eliminados, todo en una sola pasada C de
+# str.translate en lugar de re.sub + un genexp por carácter
+_TABLA_SANITIZAR = str.maketrans(
+    {c: "_" for c in '<>:"/\\|?*'} | {i: None for i in range(32)}
+)
 
 
 def sanitize_filename(filename: str) -> str:
@@ -213,15 +406,8 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         str: Nombre de archivo sanitizado
     """
-    import re
-    import os
-
-    # Remover path separators y caracteres peligrosos
-    filename = os.path.basename(filename)
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-
-    # Remover caracteres de control
-    filename = ''.join(char for char in filename if ord(char) >= 32)
+    # Remover path separators, caracteres peligrosos y de control
+    filename = os.path.basename(filename).translate(_TABLA_SANITIZAR)
 
     # Limitar longitud
     if len(filename) > 255:
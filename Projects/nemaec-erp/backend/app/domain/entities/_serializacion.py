@@ -0,0 +1,25 @@
+"""
+🔧 Helpers de serialización compartidos por las entidades.
+
+orjson serializa datetime nativamente en C, bastante más rápido que
+formatear con isoformat() en Python por cada campo. Si orjson está
+instalado (el response layer usa ORJSONResponse), los to_dict emiten el
+objeto datetime crudo y dejan el formateo al serializador; si no, se
+mantiene el string isoformat para consumidores con json estándar. El
+texto resultante es el mismo en ambos casos (RFC 3339).
+"""
+from datetime import datetime
+from typing import Optional, Union
+
+try:
+    import orjson  # noqa: F401
+    _FECHAS_NATIVAS = True
+except ImportError:
+    _FECHAS_NATIVAS = False
+
+
+def fecha_serializable(valor: Optional[datetime]) -> Union[datetime, str, None]:
+    """Preparar un datetime para to_dict según el serializador activo"""
+    if valor is None or _FECHAS_NATIVAS:
+        return valor
+    return valor.isoformat()
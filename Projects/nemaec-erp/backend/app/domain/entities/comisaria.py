@@ -8,6 +8,8 @@ from datetime import datetime
 from typing import List, Optional
 from enum import Enum
 
+from app.domain.entities._serializacion import fecha_serializable
+
 
 class EstadoComisaria(str, Enum):
     """Estados posibles de una comisaría en el proyecto"""
@@ -25,13 +27,19 @@ class TipoComisaria(str, Enum):
     ESPECIAL = "especial"
 
 
-@dataclass
+# Valores de enum precalculados para to_dict: probe sobre un dict chico
+# y caliente en lugar del descriptor .value por entidad serializada
+_TIPO_VALUES = {m: m.value for m in TipoComisaria}
+_ESTADO_VALUES = {m: m.value for m in EstadoComisaria}
+
+
+@dataclass(slots=True)
 class Coordenadas:
     """Value Object para coordenadas geográficas"""
     lat: float
     lng: float
 
-@dataclass
+@dataclass(slots=True)
 class Ubicacion:
     """Value Object para ubicación geográfica"""
     departamento: str
@@ -46,7 +54,7 @@ class Ubicacion:
         return f"{self.direccion}, {self.distrito}, {self.provincia}, {self.departamento}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Comisaria:
     """
     Entidad de dominio Comisaría.
@@ -131,23 +139,30 @@ class Comisaria:
         delta = self.fecha_fin_programada - self.fecha_inicio_programada
         return delta.days
 
-    def dias_transcurridos(self) -> Optional[int]:
+    def dias_transcurridos(self, ahora: Optional[datetime] = None) -> Optional[int]:
         """
         Calcular días transcurridos desde inicio real.
 
+        Args:
+            ahora: Timestamp de referencia; los serializadores en lote
+                lo calculan una vez y lo comparten entre entidades
+
         Returns:
             Optional[int]: Días transcurridos o None si no ha iniciado
         """
         if not self.fecha_inicio_real:
             return None
 
-        delta = datetime.now() - self.fecha_inicio_real
+        delta = (ahora or datetime.now()) - self.fecha_inicio_real
         return delta.days
 
-    def esta_retrasada(self) -> bool:
+    def esta_retrasada(self, ahora: Optional[datetime] = None) -> bool:
         """
         Verificar si la comisaría está retrasada según cronograma.
 
+        Args:
+            ahora: Timestamp de referencia (opcional, ver dias_transcurridos)
+
         Returns:
             bool: True si está retrasada
         """
@@ -156,7 +171,7 @@ class Comisaria:
 
         # Si ya pasó la fecha programada y no está completada
         return (
-            datetime.now() > self.fecha_fin_programada and
+            (ahora or datetime.now()) > self.fecha_fin_programada and
             self.estado != EstadoComisaria.COMPLETADA
         )
 
@@ -202,19 +217,43 @@ class Comisaria:
         self.updated_at = datetime.now()
         # TODO: Agregar campo motivo_suspension en el futuro
 
-    def to_dict(self) -> dict:
+    @staticmethod
+    def bulk_to_dict(
+        comisarias: List["Comisaria"],
+        ahora: Optional[datetime] = None
+    ) -> List[dict]:
+        """
+        Serializar una lista de comisarías compartiendo un timestamp.
+
+        Args:
+            comisarias: Comisarías a serializar
+            ahora: Timestamp de referencia (por defecto, ahora)
+
+        Returns:
+            List[dict]: Un diccionario por comisaría
+        """
+        ahora = ahora or datetime.now()
+        return [comisaria.to_dict(ahora) for comisaria in comisarias]
+
+    def to_dict(self, ahora: Optional[datetime] = None) -> dict:
         """
         Convertir entidad a diccionario para serialización.
 
+        Args:
+            ahora: Timestamp de referencia compartido; un listado de N
+                comisarías llama datetime.now() una sola vez en lugar
+                de una por entidad serializada
+
         Returns:
             dict: Representación en diccionario
         """
+        ahora = ahora or datetime.now()
         return {
             "id": self.id,
             "codigo": self.codigo,
             "nombre": self.nombre,
-            "tipo": self.tipo.value,
-            "estado": self.estado.value,
+            "tipo": _TIPO_VALUES[self.tipo],
+            "estado": _ESTADO_VALUES[self.estado],
             "ubicacion": {
                 "departamento": self.ubicacion.departamento,
                 "provincia": self.ubicacion.provincia,
@@ -227,14 +266,14 @@ class Comisaria:
             },
             "presupuesto_total": self.presupuesto_total(),
             "dias_programados": self.dias_programados(),
-            "dias_transcurridos": self.dias_transcurridos(),
-            "esta_retrasada": self.esta_retrasada(),
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "dias_transcurridos": self.dias_transcurridos(ahora),
+            "esta_retrasada": self.esta_retrasada(ahora),
+            "created_at": fecha_serializable(self.created_at),
+            "updated_at": fecha_serializable(self.updated_at),
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ComisariaCreate:
     """
     DTO para crear una nueva comisaría.
@@ -9,6 +9,8 @@ from typing import List, Optional, Dict, Any
 from enum import Enum
 from decimal import Decimal
 
+from app.domain.entities._serializacion import fecha_serializable
+
 
 class TipoContrato(str, Enum):
     """Tipos de contrato según NEMAEC"""
@@ -36,7 +38,12 @@ class TipoPersonal(str, Enum):
     ENCARGADO_PNP = "encargado_pnp"
 
 
-@dataclass
+# Valores de enum precalculados para to_dict (ver comisaria.py)
+_TIPO_VALUES = {m: m.value for m in TipoContrato}
+_ESTADO_VALUES = {m: m.value for m in EstadoContrato}
+
+
+@dataclass(slots=True)
 class PersonalContrato:
     """Value Object para personal del contrato"""
     tipo: TipoPersonal
@@ -54,12 +61,12 @@ class PersonalContrato:
         """Obtener nombre completo"""
         return f"{self.nombres} {self.apellidos}".strip()
 
-    def esta_activo(self) -> bool:
+    def esta_activo(self, ahora: Optional[datetime] = None) -> bool:
         """Verificar si el personal está actualmente activo"""
         if not self.activo:
             return False
 
-        now = datetime.now()
+        now = ahora or datetime.now()
 
         # Si tiene fecha de inicio, debe haber pasado
         if self.fecha_inicio and now < self.fecha_inicio:
@@ -72,7 +79,7 @@ class PersonalContrato:
         return True
 
 
-@dataclass
+@dataclass(slots=True)
 class ComisariaContrato:
     """Value Object para comisarías incluidas en el contrato"""
     comisaria_id: int
@@ -86,7 +93,7 @@ class ComisariaContrato:
             raise ValueError("Monto debe ser mayor a cero")
 
 
-@dataclass
+@dataclass(slots=True)
 class Contrato:
     """
     Entidad de dominio Contrato.
@@ -133,8 +140,29 @@ class Contrato:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: Optional[datetime] = None
 
+    # Índice de nombres de comisarías para chequeo de duplicados O(1);
+    # se siembra en __post_init__ y lo mantiene agregar_comisaria (las
+    # mutaciones a la lista deben pasar por ese método)
+    _comisarias_nombres: set = field(
+        default_factory=set, init=False, repr=False, compare=False
+    )
+
+    # Índice de personal por tipo: get_personal_por_tipo recorre solo el
+    # bucket de su tipo en lugar de todo el plantel; lo mantiene
+    # agregar_personal (el flag activo se evalúa al leer, así que los
+    # cambios de estado no desincronizan el índice)
+    _personal_por_tipo: Dict[TipoPersonal, List[PersonalContrato]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self):
         """Validaciones de integridad"""
+        self._comisarias_nombres = {c.nombre_cpnp for c in self.comisarias}
+
+        self._personal_por_tipo = {}
+        for p in self.personal:
+            self._personal_por_tipo.setdefault(p.tipo, []).append(p)
+
         if not self.numero:
             raise ValueError("Número de contrato es requerido")
 
@@ -168,27 +196,34 @@ class Contrato:
 
         return self.fecha_inicio_real + timedelta(days=self.plazo_total_dias())
 
-    def dias_transcurridos(self) -> Optional[int]:
+    def dias_transcurridos(self, ahora: Optional[datetime] = None) -> Optional[int]:
         """
         Días transcurridos desde inicio del contrato.
 
+        Args:
+            ahora: Timestamp de referencia; los serializadores en lote
+                lo calculan una vez y lo comparten entre entidades
+
         Returns:
             Optional[int]: Días transcurridos o None si no ha iniciado
         """
         if not self.fecha_inicio_real:
             return None
 
-        delta = datetime.now() - self.fecha_inicio_real
+        delta = (ahora or datetime.now()) - self.fecha_inicio_real
         return max(0, delta.days)
 
-    def porcentaje_tiempo_transcurrido(self) -> Optional[float]:
+    def porcentaje_tiempo_transcurrido(self, ahora: Optional[datetime] = None) -> Optional[float]:
         """
         Porcentaje de tiempo transcurrido del contrato.
 
+        Args:
+            ahora: Timestamp de referencia (opcional)
+
         Returns:
             Optional[float]: Porcentaje (0-100) o None si no ha iniciado
         """
-        dias_transcurridos = self.dias_transcurridos()
+        dias_transcurridos = self.dias_transcurridos(ahora)
         if dias_transcurridos is None:
             return None
 
@@ -199,10 +234,13 @@ class Contrato:
         porcentaje = (dias_transcurridos / total_dias) * 100
         return min(100.0, porcentaje)
 
-    def esta_vencido(self) -> bool:
+    def esta_vencido(self, ahora: Optional[datetime] = None) -> bool:
         """
         Verificar si el contrato está vencido.
 
+        Args:
+            ahora: Timestamp de referencia (opcional)
+
         Returns:
             bool: True si pasó la fecha límite
         """
@@ -210,7 +248,7 @@ class Contrato:
         if not fecha_fin:
             return False
 
-        return datetime.now() > fecha_fin and self.estado == EstadoContrato.EN_EJECUCION
+        return (ahora or datetime.now()) > fecha_fin and self.estado == EstadoContrato.EN_EJECUCION
 
     def puede_iniciar(self) -> bool:
         """
@@ -225,39 +263,48 @@ class Contrato:
             self.get_monitor_activo() is not None
         )
 
-    def get_personal_por_tipo(self, tipo: TipoPersonal) -> List[PersonalContrato]:
+    def get_personal_por_tipo(
+        self,
+        tipo: TipoPersonal,
+        ahora: Optional[datetime] = None
+    ) -> List[PersonalContrato]:
         """
         Obtener personal activo de un tipo específico.
 
         Args:
             tipo: Tipo de personal a buscar
+            ahora: Timestamp de referencia (opcional)
 
         Returns:
             List[PersonalContrato]: Lista de personal del tipo
         """
         return [
-            p for p in self.personal
-            if p.tipo == tipo and p.esta_activo()
+            p for p in self._personal_por_tipo.get(tipo, ())
+            if p.esta_activo(ahora)
         ]
 
-    def get_monitor_activo(self) -> Optional[PersonalContrato]:
+    def get_monitor_activo(
+        self, ahora: Optional[datetime] = None
+    ) -> Optional[PersonalContrato]:
         """
         Obtener monitor NEMAEC activo.
 
         Returns:
             Optional[PersonalContrato]: Monitor activo o None
         """
-        monitores = self.get_personal_por_tipo(TipoPersonal.MONITOR_NEMAEC)
+        monitores = self.get_personal_por_tipo(TipoPersonal.MONITOR_NEMAEC, ahora)
         return monitores[0] if monitores else None
 
-    def get_ingeniero_residente(self) -> Optional[PersonalContrato]:
+    def get_ingeniero_residente(
+        self, ahora: Optional[datetime] = None
+    ) -> Optional[PersonalContrato]:
         """
         Obtener ingeniero residente activo.
 
         Returns:
             Optional[PersonalContrato]: Ingeniero activo o None
         """
-        ingenieros = self.get_personal_por_tipo(TipoPersonal.INGENIERO_RESIDENTE)
+        ingenieros = self.get_personal_por_tipo(TipoPersonal.INGENIERO_RESIDENTE, ahora)
         return ingenieros[0] if ingenieros else None
 
     def monto_por_comisaria(self) -> Dict[str, Decimal]:
@@ -322,12 +369,13 @@ class Contrato:
         Args:
             comisaria: Comisaría a agregar
         """
-        # Verificar que no esté duplicada
-        nombres_existentes = [c.nombre_cpnp for c in self.comisarias]
-        if comisaria.nombre_cpnp in nombres_existentes:
+        # Verificar que no esté duplicada: lookup O(1) contra el índice
+        # en lugar de reconstruir la lista de nombres en cada inserción
+        if comisaria.nombre_cpnp in self._comisarias_nombres:
             raise ValueError(f"Comisaría {comisaria.nombre_cpnp} ya existe en el contrato")
 
         self.comisarias.append(comisaria)
+        self._comisarias_nombres.add(comisaria.nombre_cpnp)
         self.updated_at = datetime.now()
 
     def agregar_personal(self, personal: PersonalContrato) -> None:
@@ -348,31 +396,65 @@ class Contrato:
                     p.fecha_fin = datetime.now()
 
         self.personal.append(personal)
+        self._personal_por_tipo.setdefault(personal.tipo, []).append(personal)
         self.updated_at = datetime.now()
 
-    def to_dict(self) -> Dict[str, Any]:
+    @staticmethod
+    def bulk_to_dict(
+        contratos: List["Contrato"],
+        ahora: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Serializar una lista de contratos compartiendo un timestamp.
+
+        Camino para endpoints de listado: datetime.now() se resuelve una
+        sola vez para el lote completo y cada to_dict reutiliza esa
+        referencia para todos sus campos derivados del tiempo.
+
+        Args:
+            contratos: Contratos a serializar
+            ahora: Timestamp de referencia (por defecto, ahora)
+
+        Returns:
+            List[Dict[str, Any]]: Un diccionario por contrato
+        """
+        ahora = ahora or datetime.now()
+        return [contrato.to_dict(ahora) for contrato in contratos]
+
+    def to_dict(self, ahora: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Convertir entidad a diccionario para serialización.
 
+        Args:
+            ahora: Timestamp de referencia compartido; un listado de N
+                contratos llama datetime.now() una sola vez en lugar de
+                varias por entidad serializada
+
         Returns:
             Dict[str, Any]: Representación en diccionario
         """
+        ahora = ahora or datetime.now()
+
+        # Derivados calculados una sola vez: el monitor implica un scan
+        # de personal y antes se buscaba dos veces (None check + nombre)
+        monitor = self.get_monitor_activo(ahora)
+
         return {
             "id": self.id,
             "numero": self.numero,
-            "fecha": self.fecha.isoformat(),
-            "tipo": self.tipo.value,
-            "estado": self.estado.value,
+            "fecha": fecha_serializable(self.fecha),
+            "tipo": _TIPO_VALUES[self.tipo],
+            "estado": _ESTADO_VALUES[self.estado],
             "contratado": self.contratado,
             "ruc_contratado": self.ruc_contratado,
             "item_contratado": self.item_contratado,
             "monto_total": float(self.monto_total),
             "plazo_total_dias": self.plazo_total_dias(),
-            "porcentaje_tiempo": self.porcentaje_tiempo_transcurrido(),
-            "esta_vencido": self.esta_vencido(),
-            "comisarias_count": len([c for c in self.comisarias if c.activa]),
-            "personal_activo": len([p for p in self.personal if p.esta_activo()]),
-            "monitor_activo": self.get_monitor_activo().nombre_completo() if self.get_monitor_activo() else None,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "porcentaje_tiempo": self.porcentaje_tiempo_transcurrido(ahora),
+            "esta_vencido": self.esta_vencido(ahora),
+            "comisarias_count": sum(1 for c in self.comisarias if c.activa),
+            "personal_activo": sum(1 for p in self.personal if p.esta_activo(ahora)),
+            "monitor_activo": monitor.nombre_completo() if monitor else None,
+            "created_at": fecha_serializable(self.created_at),
+            "updated_at": fecha_serializable(self.updated_at),
         }
\ No newline at end of file
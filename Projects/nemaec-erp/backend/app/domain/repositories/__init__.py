@@ -9,10 +9,12 @@ Las implementaciones concretas van en infrastructure/database/repositories/
 """
 from .comisaria_repository import ComisariaRepository
 from .contrato_repository import ContratoRepository
+from .dashboard_repository import DashboardRepository
 from .partida_repository import PartidaRepository
 
 __all__ = [
     "ComisariaRepository",
     "ContratoRepository",
+    "DashboardRepository",
     "PartidaRepository",
 ]
\ No newline at end of file
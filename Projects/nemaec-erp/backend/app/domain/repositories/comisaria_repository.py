@@ -4,7 +4,7 @@ Definición abstracta del repositorio de Comisarías.
 Sin dependencias de infraestructura - solo contratos de negocio.
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from app.domain.entities.comisaria import Comisaria, EstadoComisaria
 
 
@@ -35,6 +35,23 @@ class ComisariaRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def create_many(self, comisarias: List[Comisaria]) -> List[Comisaria]:
+        """
+        Crear múltiples comisarías en una sola operación.
+
+        Args:
+            comisarias: Entidades a crear (id debe ser None en todas)
+
+        Returns:
+            List[Comisaria]: Entidades creadas con id asignado
+
+        Note:
+            Las implementaciones deben usar un único INSERT multi-fila
+            (o COPY) para evitar N round trips en cargas masivas
+        """
+        pass
+
     @abstractmethod
     async def get_by_id(self, comisaria_id: int) -> Optional[Comisaria]:
         """
@@ -48,6 +65,24 @@ class ComisariaRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_by_ids(self, comisaria_ids: List[int]) -> Dict[int, Comisaria]:
+        """
+        Obtener múltiples comisarías por ID en una sola consulta.
+
+        Args:
+            comisaria_ids: IDs de las comisarías
+
+        Returns:
+            Dict[int, Comisaria]: Entidades encontradas, indexadas por ID
+            (los IDs inexistentes simplemente no aparecen)
+
+        Note:
+            Reemplaza N llamadas a get_by_id por un único
+            SELECT ... WHERE id IN (...)
+        """
+        pass
+
     @abstractmethod
     async def get_by_codigo(self, codigo: str) -> Optional[Comisaria]:
         """
@@ -61,6 +96,24 @@ class ComisariaRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_by_codigos(self, codigos: List[str]) -> Dict[str, Comisaria]:
+        """
+        Obtener múltiples comisarías por código en una sola consulta.
+
+        Args:
+            codigos: Códigos de las comisarías
+
+        Returns:
+            Dict[str, Comisaria]: Entidades encontradas, indexadas por código
+            (los códigos inexistentes simplemente no aparecen)
+
+        Note:
+            Reemplaza N llamadas a get_by_codigo por un único
+            SELECT ... WHERE codigo IN (...)
+        """
+        pass
+
     @abstractmethod
     async def list_all(
         self,
@@ -79,6 +132,47 @@ class ComisariaRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def iter_all(self, batch_size: int = 500) -> AsyncIterator[Comisaria]:
+        """
+        Iterar sobre todas las comisarías en lotes de tamaño acotado.
+
+        Args:
+            batch_size: Tamaño de cada lote leído de la base de datos
+
+        Yields:
+            Comisaria: Entidades una a una, en orden de ID
+
+        Note:
+            Para recorrer el conjunto completo, preferir esto sobre
+            paginar con list_all: las implementaciones deben usar
+            paginación por keyset (WHERE id > :ultimo ORDER BY id),
+            que es O(N) y de memoria acotada, mientras que offset
+            relee los registros anteriores en cada página
+        """
+        pass
+
+    @abstractmethod
+    def iter_by_estado(
+        self,
+        estado: EstadoComisaria,
+        batch_size: int = 500
+    ) -> AsyncIterator[Comisaria]:
+        """
+        Iterar sobre las comisarías de un estado en lotes acotados.
+
+        Args:
+            estado: Estado a filtrar
+            batch_size: Tamaño de cada lote leído de la base de datos
+
+        Yields:
+            Comisaria: Entidades una a una, en orden de ID
+
+        Note:
+            Mismo contrato de keyset que iter_all
+        """
+        pass
+
     @abstractmethod
     async def list_by_estado(
         self,
@@ -126,6 +220,10 @@ class ComisariaRepository(ABC):
 
         Returns:
             List[Comisaria]: Lista de comisarías retrasadas
+
+        Note:
+            Materializa el resultado completo; para recorridos masivos
+            preferir iter_all / iter_by_estado
         """
         pass
 
@@ -175,6 +273,23 @@ class ComisariaRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def exists_by_codigos(self, codigos: List[str]) -> set:
+        """
+        Verificar qué códigos de una lista ya existen.
+
+        Args:
+            codigos: Códigos a verificar
+
+        Returns:
+            set: Subconjunto de códigos que ya existen
+
+        Note:
+            Reemplaza N llamadas a exists_by_codigo por un único
+            SELECT ... WHERE codigo IN (...)
+        """
+        pass
+
     @abstractmethod
     async def count_total(self) -> int:
         """
@@ -253,6 +368,36 @@ class ComisariaRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def count_por_region(self) -> Dict[str, int]:
+        """
+        Contar comisarías por región (departamento).
+
+        Returns:
+            Dict[str, int]: Conteo por departamento
+            Ejemplo: {"Lima": 12, "Cusco": 5}
+
+        Note:
+            Las implementaciones deben resolver el conteo con un
+            GROUP BY en la base de datos; el dashboard solo necesita
+            K regiones, no N entidades materializadas
+        """
+        pass
+
+    @abstractmethod
+    async def ids_por_region(self) -> Dict[str, List[int]]:
+        """
+        Agrupar IDs de comisarías por región (departamento).
+
+        Returns:
+            Dict[str, List[int]]: IDs agrupados por departamento
+
+        Note:
+            Combinar con get_by_ids cuando se necesiten las entidades
+            completas de algunas regiones; evita hidratar todo el país
+        """
+        pass
+
     @abstractmethod
     async def get_comisarias_por_region(self) -> Dict[str, List[Comisaria]]:
         """
@@ -260,5 +405,10 @@ class ComisariaRepository(ABC):
 
         Returns:
             Dict[str, List[Comisaria]]: Comisarías agrupadas por departamento
+
+        Note:
+            Materializa todas las entidades en memoria; preferir
+            count_por_region o ids_por_region + get_by_ids según lo que
+            el caller realmente necesite
         """
         pass
\ No newline at end of file
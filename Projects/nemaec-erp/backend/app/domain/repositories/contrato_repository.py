@@ -47,6 +47,24 @@ class ContratoRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_by_ids(self, contrato_ids: List[int]) -> Dict[int, Contrato]:
+        """
+        Obtener múltiples contratos por ID en una sola consulta.
+
+        Args:
+            contrato_ids: IDs de los contratos
+
+        Returns:
+            Dict[int, Contrato]: Entidades encontradas, indexadas por ID
+            (los IDs inexistentes simplemente no aparecen)
+
+        Note:
+            Reemplaza N llamadas a get_by_id por un único
+            SELECT ... WHERE id IN (...)
+        """
+        pass
+
     @abstractmethod
     async def get_by_numero(self, numero: str) -> Optional[Contrato]:
         """
@@ -184,6 +202,25 @@ class ContratoRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_contratos_counts(self, dias_por_vencer: int = 30) -> Dict[str, int]:
+        """
+        Obtener conteos de contratos activos, vencidos y por vencer.
+
+        Args:
+            dias_por_vencer: Ventana en días para "por vencer"
+
+        Returns:
+            Dict[str, int]: Conteos por categoría
+            Ejemplo: {"activos": 45, "vencidos": 3, "por_vencer": 8}
+
+        Note:
+            Un solo SELECT con agregados condicionales
+            (COUNT(*) FILTER (WHERE ...)): evita materializar tres listas
+            completas solo para tomar su len()
+        """
+        pass
+
     @abstractmethod
     async def update(self, contrato: Contrato) -> Contrato:
         """
@@ -231,12 +268,24 @@ class ContratoRepository(ABC):
         pass
 
     @abstractmethod
-    async def count_total(self) -> int:
+    async def count_total(self, approximate: bool = False) -> int:
         """
         Obtener total de contratos registrados.
 
+        Args:
+            approximate: Aceptar un conteo aproximado (para tarjetas de
+                dashboard donde el valor exacto no importa)
+
         Returns:
             int: Número total de contratos
+
+        Note:
+            COUNT(*) exacto escanea la tabla completa. Con
+            approximate=True las implementaciones PostgreSQL deben leer
+            las estadísticas del planner, O(1):
+            SELECT reltuples::bigint FROM pg_class
+            WHERE relname = 'contratos'
+            (en SQLite no hay equivalente y se devuelve el exacto)
         """
         pass
 
@@ -251,12 +300,42 @@ class ContratoRepository(ABC):
         pass
 
     @abstractmethod
-    async def count_by_tipo(self) -> Dict[str, int]:
+    async def count_by_tipo(self, approximate: bool = False) -> Dict[str, int]:
         """
         Obtener conteo de contratos por tipo.
 
+        Args:
+            approximate: Aceptar conteos aproximados para dashboards
+
         Returns:
             Dict[str, int]: Conteo por tipo (equipamiento, mantenimiento, mixto)
+
+        Note:
+            Con approximate=True las implementaciones PostgreSQL pueden
+            estimar desde pg_stats (most_common_vals/most_common_freqs
+            de la columna tipo, multiplicadas por reltuples) sin tocar
+            la tabla; en SQLite se devuelve el exacto
+        """
+        pass
+
+    @abstractmethod
+    async def get_dashboard_aggregates(self) -> Dict[str, Any]:
+        """
+        Obtener todos los agregados del dashboard en una sola consulta.
+
+        Returns:
+            Dict[str, Any]: Total de contratos, conteos por estado y por
+            tipo, y los montos de get_estadisticas_financieras, en un
+            solo dict
+
+        Note:
+            Los dashboards llaman count_total, count_by_estado,
+            count_by_tipo y get_estadisticas_financieras seguidos, un
+            scan de tabla cada uno. Las implementaciones deben fusionar
+            todo en UNA consulta con cláusulas FILTER:
+            SELECT COUNT(*), COUNT(*) FILTER (WHERE estado = ...), ...,
+            SUM(monto) FILTER (...), AVG(monto) FROM contratos; los
+            métodos individuales pueden delegar en este resultado
         """
         pass
 
@@ -0,0 +1,56 @@
+"""
+📊 DASHBOARD REPOSITORY - Abstract Interface
+Definición abstracta del repositorio de agregados del dashboard.
+Rollup precalculado en la base para el camino de lectura más caliente.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, Any
+
+
+class DashboardRepository(ABC):
+    """
+    Repositorio abstracto para los agregados del dashboard ejecutivo.
+
+    En lugar de que el servicio arme el dashboard con ~10 consultas
+    independientes, la implementación mantiene un rollup precalculado
+    (en PostgreSQL: vista materializada mv_dashboard_ejecutivo) que se
+    lee con un único SELECT. Se paga un costo pequeño en el camino de
+    escritura (refresh) a cambio de una lectura casi constante.
+    """
+
+    @abstractmethod
+    async def get_ejecutivo_bundle(self) -> Dict[str, Any]:
+        """
+        Obtener todos los agregados del dashboard ejecutivo en una consulta.
+
+        Returns:
+            Dict[str, Any]: Agregados precalculados
+            Ejemplo: {
+                "stats_comisarias": {...},      # get_estadisticas_resumen
+                "stats_contratos": {...},       # get_estadisticas_financieras
+                "stats_avances": {...},         # get_estadisticas_avance
+                "contratos_counts": {...},      # get_contratos_counts
+                "alertas_criticas_count": 12    # count_alertas_criticas
+            }
+            Cada bloque tiene la misma estructura que el método de
+            repositorio al que reemplaza.
+
+        Note:
+            Un solo SELECT sobre el rollup (mv_dashboard_ejecutivo en
+            PostgreSQL); las consultas top-N (alertas inmediatas,
+            comisarías en riesgo) quedan fuera del bundle porque
+            devuelven filas, no agregados
+        """
+        pass
+
+    @abstractmethod
+    async def refresh_ejecutivo_bundle(self) -> None:
+        """
+        Recalcular el rollup del dashboard.
+
+        Note:
+            En PostgreSQL: REFRESH MATERIALIZED VIEW CONCURRENTLY.
+            Invocar desde las escrituras de partidas/contratos o desde
+            un job periódico (~30s); el dashboard tolera ese desfase
+        """
+        pass
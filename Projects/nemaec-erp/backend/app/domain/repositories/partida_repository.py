@@ -47,6 +47,24 @@ class PartidaRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_by_ids(self, partida_ids: List[int]) -> Dict[int, Partida]:
+        """
+        Obtener múltiples partidas por ID en una sola consulta.
+
+        Args:
+            partida_ids: IDs de las partidas
+
+        Returns:
+            Dict[int, Partida]: Entidades encontradas, indexadas por ID
+            (los IDs inexistentes simplemente no aparecen)
+
+        Note:
+            Reemplaza N llamadas a get_by_id por un único
+            SELECT ... WHERE id IN (...)
+        """
+        pass
+
     @abstractmethod
     async def get_by_nid_and_comisaria(
         self,
@@ -65,6 +83,30 @@ class PartidaRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_by_nids(
+        self,
+        nids: List[int],
+        comisaria_id: int
+    ) -> Dict[int, Partida]:
+        """
+        Obtener múltiples partidas de una comisaría por NID en una consulta.
+
+        Args:
+            nids: NIDs de las partidas (del Excel original)
+            comisaria_id: ID de la comisaría
+
+        Returns:
+            Dict[int, Partida]: Entidades encontradas, indexadas por NID
+            (los NIDs inexistentes simplemente no aparecen)
+
+        Note:
+            Reemplaza N llamadas a get_by_nid_and_comisaria por un único
+            SELECT ... WHERE comisaria_id = :c AND nid IN (...);
+            clave para imports Excel grandes
+        """
+        pass
+
     @abstractmethod
     async def list_by_comisaria(
         self,
@@ -82,6 +124,14 @@ class PartidaRepository(ABC):
 
         Returns:
             List[Partida]: Lista de partidas de la comisaría
+
+        Note:
+            Las implementaciones deben hidratar los avances de todas las
+            partidas en una sola consulta adicional (selectinload o un
+            LATERAL limitado al último avance), nunca una consulta por
+            partida: get_ultimo_avance() asume que avances ya está en
+            memoria y los consumidores (plantillas Excel, dashboard) lo
+            llaman en loop
         """
         pass
 
@@ -144,6 +194,10 @@ class PartidaRepository(ABC):
 
         Returns:
             List[Partida]: Lista de partidas ejecutables
+
+        Note:
+            Igual que list_by_comisaria: los avances se cargan en bloque
+            (una consulta para todo el lote), no por partida
         """
         pass
 
@@ -228,7 +282,14 @@ class PartidaRepository(ABC):
             List[Partida]: Lista de partidas creadas con IDs asignados
 
         Note:
-            Optimizado para imports masivos desde Excel
+            Optimizado para imports masivos desde Excel. Para lotes
+            grandes (>100 filas) las implementaciones PostgreSQL deben
+            usar el protocolo COPY de asyncpg (copy_records_to_table
+            sobre la conexión cruda) en lugar de INSERT ... VALUES,
+            que es varias veces más lento; como COPY no devuelve IDs,
+            recuperar las entidades con un SELECT posterior por
+            comisaria_id + nid IN (...). Para lotes chicos basta
+            add_all + flush (insertmanyvalues)
         """
         pass
 
@@ -254,6 +315,15 @@ class PartidaRepository(ABC):
 
         Returns:
             int: Número de partidas actualizadas
+
+        Note:
+            Un solo statement por lote, nunca un UPDATE por fila: para
+            actualizar por PK usar
+            session.execute(update(Modelo), avances_data) con executemany;
+            para insertar avances nuevos,
+            session.execute(insert(Modelo), avances_data) activa el
+            camino insertmanyvalues (paginado por
+            insertmanyvalues_page_size del engine)
         """
         pass
 
@@ -270,6 +340,29 @@ class PartidaRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def count_total(self, approximate: bool = False) -> int:
+        """
+        Obtener total de partidas registradas.
+
+        Args:
+            approximate: Aceptar un conteo aproximado (para tarjetas de
+                dashboard donde el valor exacto no importa)
+
+        Returns:
+            int: Número total de partidas
+
+        Note:
+            COUNT(*) exacto escanea la tabla completa; con millones de
+            partidas eso domina el tiempo del dashboard. Con
+            approximate=True las implementaciones PostgreSQL deben leer
+            las estadísticas del planner, O(1):
+            SELECT reltuples::bigint FROM pg_class
+            WHERE relname = 'partidas'
+            (en SQLite no hay equivalente y se devuelve el exacto)
+        """
+        pass
+
     @abstractmethod
     async def count_by_estado(
         self,
@@ -302,6 +395,32 @@ class PartidaRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_dashboard_aggregates(
+        self,
+        comisaria_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Obtener todos los agregados del dashboard en una sola consulta.
+
+        Args:
+            comisaria_id: Filtrar por comisaría (opcional)
+
+        Returns:
+            Dict[str, Any]: Total de partidas, conteos por estado y por
+            criticidad, y montos total/ejecutado, en un solo dict
+
+        Note:
+            Los dashboards llaman count_by_comisaria, count_by_estado y
+            count_by_criticidad seguidos, y cada uno escanea la tabla.
+            Las implementaciones deben resolver esto con UNA consulta
+            usando cláusulas FILTER:
+            SELECT COUNT(*), COUNT(*) FILTER (WHERE estado = ...), ...,
+            SUM(precio_total), ... amortizando el scan N a 1; los
+            count_by_* individuales pueden delegar en este resultado
+        """
+        pass
+
     @abstractmethod
     async def get_estadisticas_avance(
         self,
@@ -329,6 +448,28 @@ class PartidaRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_estadisticas_avance_bulk(
+        self,
+        comisaria_ids: List[int]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Obtener estadísticas de avance para varias comisarías en una consulta.
+
+        Args:
+            comisaria_ids: IDs de las comisarías a consultar
+
+        Returns:
+            Dict[int, Dict[str, Any]]: Estadísticas por comisaría ID,
+            con la misma estructura que get_estadisticas_avance
+
+        Note:
+            Las implementaciones deben usar un único
+            SELECT ... WHERE comisaria_id IN (...) GROUP BY comisaria_id
+            en lugar de N consultas individuales
+        """
+        pass
+
     @abstractmethod
     async def get_resumen_por_comisaria(self) -> Dict[int, Dict[str, Any]]:
         """
@@ -383,6 +524,15 @@ class PartidaRepository(ABC):
 
         Returns:
             List[Partida]: Lista de partidas que coinciden
+
+        Note:
+            Sobre PostgreSQL las implementaciones deben buscar con la
+            columna search_vector de PartidaModel (tsvector + índice GIN):
+            WHERE search_vector @@ plainto_tsquery('spanish', :query)
+            ORDER BY ts_rank(...) DESC, nunca con ILIKE '%...%' que
+            recorre la tabla completa. Para prefijos de código muy cortos
+            (< 3 caracteres) usar el índice btree de codigo_partida con
+            LIKE 'xx%'
         """
         pass
 
@@ -426,6 +576,37 @@ class PartidaRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_alertas_inmediatas(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Obtener solo las alertas que requieren acción inmediata.
+
+        Args:
+            limit: Número máximo de alertas a retornar
+
+        Returns:
+            List[Dict[str, Any]]: Alertas con requiere_accion_inmediata=True,
+            ordenadas por severidad descendente
+
+        Note:
+            El filtro y el LIMIT deben aplicarse en SQL para no transferir
+            el listado completo de alertas al proceso Python
+        """
+        pass
+
+    @abstractmethod
+    async def count_alertas_criticas(self) -> int:
+        """
+        Contar alertas de nivel crítico.
+
+        Returns:
+            int: Número de alertas críticas
+
+        Note:
+            COUNT en SQL; evita materializar las alertas solo para un len()
+        """
+        pass
+
     @abstractmethod
     async def export_excel_data(
         self,
@@ -4,7 +4,8 @@ SQLAlchemy models para todas las entidades del sistema.
 """
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, JSON
+from sqlalchemy import Column, Index, Integer, String, Float, DateTime, Boolean, Text, JSON
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -78,6 +79,13 @@ class PartidaModel(Base):
     """
     __tablename__ = "partidas"
 
+    # El índice GIN hace que search() sea un lookup de índice en vez de un
+    # seq-scan con ILIKE '%...%' sobre toda la tabla; en SQLite (desarrollo)
+    # la columna es texto y el índice se crea como btree normal, inofensivo
+    __table_args__ = (
+        Index("partidas_search_idx", "search_vector", postgresql_using="gin"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     cronograma_id = Column(Integer, nullable=False, index=True)
     codigo_interno = Column(String(50), nullable=False, index=True)
@@ -99,6 +107,14 @@ class PartidaModel(Base):
     nivel_jerarquia = Column(Integer, default=1)
     partida_padre = Column(String(50), nullable=True)
 
+    # Vector de búsqueda full-text (solo PostgreSQL). Se mantiene con un
+    # trigger BEFORE INSERT OR UPDATE:
+    #   search_vector := setweight(to_tsvector('spanish', codigo_partida), 'A')
+    #                 || setweight(to_tsvector('spanish', descripcion), 'B')
+    search_vector = Column(
+        Text().with_variant(TSVECTOR(), "postgresql"), nullable=True
+    )
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,90 @@
+"""
+🗃️ Cache TTL para consultas de repositorios.
+
+Los dashboards repiten las mismas lecturas agregadas (conteos,
+estadísticas, resúmenes) con los mismos parámetros en cada refresco.
+Estos decoradores cachean el resultado por (método, argumentos) durante
+un TTL corto y vacían el cache cuando el repositorio escribe.
+
+El cache es por clase de repositorio y a nivel de proceso (dict plano
+con expiración time.monotonic, como _CODIGO_CACHE del repositorio de
+comisarías): las instancias concretas viven lo que dura una request,
+así que un cache por instancia nunca tendría hits. El orden es siempre
+escribir en base de datos primero e invalidar después, para no servir
+lecturas rotas. En despliegues con varios workers cada proceso tiene su
+propio cache; la ventana de desfase queda acotada por el TTL.
+
+Uso en un repositorio concreto::
+
+    class SqlAlchemyContratoRepository(ContratoRepository):
+
+        @consulta_cacheada(ttl=60.0)
+        async def get_estadisticas_financieras(self):
+            ...
+
+        @invalida_consultas
+        async def update(self, contrato):
+            ...
+"""
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Tuple
+
+# TTL por defecto y tope de entradas por clase de repositorio; al
+# llenarse se vacía entero (las entradas son baratas de recalcular)
+_TTL_DEFECTO = 300.0
+_MAX_ENTRADAS = 500
+
+# Un cache por clase de repositorio: {clase: {clave: (expira, resultado)}}
+_CACHES: Dict[type, Dict[Tuple, Tuple[float, Any]]] = {}
+
+
+def _cache_de(repositorio: Any) -> Dict[Tuple, Tuple[float, Any]]:
+    """Obtener (creando si hace falta) el cache de la clase del repositorio"""
+    clase = type(repositorio)
+    cache = _CACHES.get(clase)
+    if cache is None:
+        cache = _CACHES[clase] = {}
+    return cache
+
+
+def consulta_cacheada(ttl: float = _TTL_DEFECTO) -> Callable:
+    """
+    Cachear el resultado de un método de lectura async durante `ttl` segundos.
+
+    La clave es (nombre del método, args, kwargs); los argumentos deben
+    ser hashables, que es el caso de los filtros de los repositorios
+    (ints, strings, enums).
+    """
+    def decorador(fn: Callable) -> Callable:
+        @wraps(fn)
+        async def envoltura(self, *args, **kwargs):
+            cache = _cache_de(self)
+            clave = (fn.__name__, args, tuple(sorted(kwargs.items())))
+            entrada = cache.get(clave)
+            if entrada is not None and entrada[0] > time.monotonic():
+                return entrada[1]
+
+            resultado = await fn(self, *args, **kwargs)
+
+            if len(cache) >= _MAX_ENTRADAS:
+                cache.clear()
+            cache[clave] = (time.monotonic() + ttl, resultado)
+            return resultado
+
+        return envoltura
+    return decorador
+
+
+def invalida_consultas(fn: Callable) -> Callable:
+    """
+    Vaciar el cache de la clase tras un método mutador (create/update/
+    delete/bulk_*). Se invalida después de escribir, nunca antes.
+    """
+    @wraps(fn)
+    async def envoltura(self, *args, **kwargs):
+        resultado = await fn(self, *args, **kwargs)
+        _cache_de(self).clear()
+        return resultado
+
+    return envoltura
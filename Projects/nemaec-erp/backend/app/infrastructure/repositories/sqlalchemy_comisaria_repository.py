@@ -1,138 +1,267 @@
-"""
-🗄️ SQLALCHEMY COMISARIA REPOSITORY
-Implementación del repositorio de comisarías usando SQLAlchemy.
-"""
-from typing import List, Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-
-from app.domain.repositories.comisaria_repository import ComisariaRepository
-from app.domain.entities.comisaria import Comisaria, ComisariaCreate
-from app.infrastructure.database.models import ComisariaModel
-
-
-class SqlAlchemyComisariaRepository(ComisariaRepository):
-    """
-    Implementación SQLAlchemy del repositorio de comisarías.
-    """
-
-    def __init__(self, session: AsyncSession):
-        self.session = session
-
-    async def create(self, comisaria_data: ComisariaCreate) -> Comisaria:
-        """Crear una nueva comisaría"""
-        # Convertir datos del domain a modelo de base de datos
-        db_comisaria = ComisariaModel(
-            nombre=comisaria_data.nombre,
-            codigo=comisaria_data.codigo,
-            tipo=comisaria_data.tipo,
-            ubicacion=comisaria_data.ubicacion.dict(),
-            presupuesto_total=comisaria_data.presupuesto_total
-        )
-
-        self.session.add(db_comisaria)
-        await self.session.flush()
-        await self.session.refresh(db_comisaria)
-
-        # Convertir modelo a entidad de dominio
-        return self._model_to_entity(db_comisaria)
-
-    async def get_by_id(self, comisaria_id: int) -> Optional[Comisaria]:
-        """Obtener comisaría por ID"""
-        result = await self.session.execute(
-            select(ComisariaModel).where(ComisariaModel.id == comisaria_id)
-        )
-        db_comisaria = result.scalar_one_or_none()
-
-        if db_comisaria is None:
-            return None
-
-        return self._model_to_entity(db_comisaria)
-
-    async def get_by_codigo(self, codigo: str) -> Optional[Comisaria]:
-        """Obtener comisaría por código"""
-        result = await self.session.execute(
-            select(ComisariaModel).where(ComisariaModel.codigo == codigo)
-        )
-        db_comisaria = result.scalar_one_or_none()
-
-        if db_comisaria is None:
-            return None
-
-        return self._model_to_entity(db_comisaria)
-
-    async def list_all(self) -> List[Comisaria]:
-        """Listar todas las comisarías"""
-        result = await self.session.execute(
-            select(ComisariaModel).order_by(ComisariaModel.created_at.desc())
-        )
-        db_comisarias = result.scalars().all()
-
-        return [self._model_to_entity(db_comisaria) for db_comisaria in db_comisarias]
-
-    async def update(self, comisaria_id: int, comisaria_data: dict) -> Optional[Comisaria]:
-        """Actualizar una comisaría"""
-        result = await self.session.execute(
-            select(ComisariaModel).where(ComisariaModel.id == comisaria_id)
-        )
-        db_comisaria = result.scalar_one_or_none()
-
-        if db_comisaria is None:
-            return None
-
-        # Actualizar campos
-        for field, value in comisaria_data.items():
-            if hasattr(db_comisaria, field):
-                setattr(db_comisaria, field, value)
-
-        await self.session.flush()
-        await self.session.refresh(db_comisaria)
-
-        return self._model_to_entity(db_comisaria)
-
-    async def delete(self, comisaria_id: int) -> bool:
-        """Eliminar una comisaría"""
-        result = await self.session.execute(
-            select(ComisariaModel).where(ComisariaModel.id == comisaria_id)
-        )
-        db_comisaria = result.scalar_one_or_none()
-
-        if db_comisaria is None:
-            return False
-
-        await self.session.delete(db_comisaria)
-        return True
-
-    def _model_to_entity(self, db_comisaria: ComisariaModel) -> Comisaria:
-        """Convertir modelo SQLAlchemy a entidad de dominio"""
-        from app.domain.entities.comisaria import Ubicacion, Coordenadas
-
-        # Reconstruir ubicación desde JSON
-        ubicacion_data = db_comisaria.ubicacion
-        coordenadas = Coordenadas(
-            lat=ubicacion_data["coordenadas"]["lat"],
-            lng=ubicacion_data["coordenadas"]["lng"]
-        )
-        ubicacion = Ubicacion(
-            direccion=ubicacion_data["direccion"],
-            distrito=ubicacion_data["distrito"],
-            provincia=ubicacion_data["provincia"],
-            departamento=ubicacion_data["departamento"],
-            coordenadas=coordenadas,
-            google_place_id=ubicacion_data.get("google_place_id")
-        )
-
-        return Comisaria(
-            id=db_comisaria.id,
-            nombre=db_comisaria.nombre,
-            codigo=db_comisaria.codigo,
-            tipo=db_comisaria.tipo,
-            ubicacion=ubicacion,
-            estado=db_comisaria.estado,
-            presupuesto_total=db_comisaria.presupuesto_total,
-            esta_retrasada=db_comisaria.esta_retrasada,
-            foto_url=db_comisaria.foto_url,
-            created_at=db_comisaria.created_at,
-            updated_at=db_comisaria.updated_at
+"""
+🗄️ SQLALCHEMY COMISARIA REPOSITORY
+Implementación del repositorio de comisarías usando SQLAlchemy.
+"""
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.domain.repositories.comisaria_repository import ComisariaRepository
+from app.infrastructure.repositories.cache_consultas import (
+    consulta_cacheada,
+    invalida_consultas,
+)
+from app.domain.entities.comisaria import Comisaria, ComisariaCreate
+from app.infrastructure.database.models import ComisariaModel
+
+
+# Cache TTL por proceso para lookups por código: el catálogo de
+# comisarías es chico (~132) y casi estático, y cada import Excel
+# arranca con un get_by_codigo. Cachear la entidad (dataclass detached,
+# sin sesión) elimina ese SELECT bajo ráfagas de uploads; cualquier
+# mutación del repositorio vacía el cache completo (es barato a este
+# tamaño). En despliegues multi-worker cada proceso mantiene el suyo.
+_CODIGO_CACHE: Dict[str, Tuple[float, Comisaria]] = {}
+_CODIGO_CACHE_TTL = 300.0
+
+
+class SqlAlchemyComisariaRepository(ComisariaRepository):
+    """
+    Implementación SQLAlchemy del repositorio de comisarías.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @invalida_consultas
+    async def create(self, comisaria_data: ComisariaCreate) -> Comisaria:
+        """Crear una nueva comisaría"""
+        # Convertir datos del domain a modelo de base de datos
+        db_comisaria = ComisariaModel(
+            nombre=comisaria_data.nombre,
+            codigo=comisaria_data.codigo,
+            tipo=comisaria_data.tipo,
+            ubicacion=comisaria_data.ubicacion.dict(),
+            presupuesto_total=comisaria_data.presupuesto_total
+        )
+
+        self.session.add(db_comisaria)
+        await self.session.flush()
+        await self.session.refresh(db_comisaria)
+
+        _CODIGO_CACHE.clear()
+
+        # Convertir modelo a entidad de dominio
+        return self._model_to_entity(db_comisaria)
+
+    @invalida_consultas
+    async def create_many(self, comisarias_data: List[ComisariaCreate]) -> List[Comisaria]:
+        """Crear múltiples comisarías con un único INSERT multi-fila"""
+        db_comisarias = [
+            ComisariaModel(
+                nombre=comisaria_data.nombre,
+                codigo=comisaria_data.codigo,
+                tipo=comisaria_data.tipo,
+                ubicacion=comisaria_data.ubicacion.dict(),
+                presupuesto_total=comisaria_data.presupuesto_total
+            )
+            for comisaria_data in comisarias_data
+        ]
+
+        # add_all + un solo flush: SQLAlchemy 2.x agrupa el lote en un
+        # INSERT multi-fila (insertmanyvalues) en lugar de N round trips
+        self.session.add_all(db_comisarias)
+        await self.session.flush()
+
+        _CODIGO_CACHE.clear()
+
+        return [self._model_to_entity(db_comisaria) for db_comisaria in db_comisarias]
+
+    async def exists_by_codigos(self, codigos: List[str]) -> set:
+        """Verificar qué códigos ya existen con un solo SELECT ... IN (...)"""
+        if not codigos:
+            return set()
+
+        result = await self.session.execute(
+            select(ComisariaModel.codigo).where(ComisariaModel.codigo.in_(codigos))
+        )
+        return set(result.scalars().all())
+
+    async def get_by_id(self, comisaria_id: int) -> Optional[Comisaria]:
+        """Obtener comisaría por ID"""
+        result = await self.session.execute(
+            select(ComisariaModel).where(ComisariaModel.id == comisaria_id)
+        )
+        db_comisaria = result.scalar_one_or_none()
+
+        if db_comisaria is None:
+            return None
+
+        return self._model_to_entity(db_comisaria)
+
+    async def get_by_codigo(self, codigo: str) -> Optional[Comisaria]:
+        """Obtener comisaría por código (cacheado por proceso, TTL 5 min)"""
+        entrada = _CODIGO_CACHE.get(codigo)
+        if entrada is not None and entrada[0] > time.monotonic():
+            return entrada[1]
+
+        result = await self.session.execute(
+            select(ComisariaModel).where(ComisariaModel.codigo == codigo)
+        )
+        db_comisaria = result.scalar_one_or_none()
+
+        if db_comisaria is None:
+            # Los códigos inexistentes no se cachean: un import puede
+            # crear la comisaría y reintentar enseguida
+            return None
+
+        comisaria = self._model_to_entity(db_comisaria)
+        _CODIGO_CACHE[codigo] = (
+            time.monotonic() + _CODIGO_CACHE_TTL, comisaria
+        )
+        return comisaria
+
+    async def iter_all(self, batch_size: int = 500) -> AsyncIterator[Comisaria]:
+        """Iterar todas las comisarías con paginación por keyset"""
+        ultimo_id = 0
+        while True:
+            result = await self.session.execute(
+                select(ComisariaModel)
+                .where(ComisariaModel.id > ultimo_id)
+                .order_by(ComisariaModel.id)
+                .limit(batch_size)
+            )
+            lote = result.scalars().all()
+            if not lote:
+                return
+
+            for db_comisaria in lote:
+                yield self._model_to_entity(db_comisaria)
+            ultimo_id = lote[-1].id
+
+    async def iter_by_estado(
+        self,
+        estado,
+        batch_size: int = 500
+    ) -> AsyncIterator[Comisaria]:
+        """Iterar comisarías de un estado con paginación por keyset"""
+        valor_estado = getattr(estado, "value", estado)
+        ultimo_id = 0
+        while True:
+            result = await self.session.execute(
+                select(ComisariaModel)
+                .where(
+                    ComisariaModel.estado == valor_estado,
+                    ComisariaModel.id > ultimo_id,
+                )
+                .order_by(ComisariaModel.id)
+                .limit(batch_size)
+            )
+            lote = result.scalars().all()
+            if not lote:
+                return
+
+            for db_comisaria in lote:
+                yield self._model_to_entity(db_comisaria)
+            ultimo_id = lote[-1].id
+
+    async def get_by_codigos(self, codigos: List[str]) -> Dict[str, Comisaria]:
+        """Obtener varias comisarías con un solo SELECT ... IN (...)"""
+        if not codigos:
+            return {}
+
+        result = await self.session.execute(
+            select(ComisariaModel).where(ComisariaModel.codigo.in_(codigos))
+        )
+
+        comisarias: Dict[str, Comisaria] = {}
+        expiracion = time.monotonic() + _CODIGO_CACHE_TTL
+        for db_comisaria in result.scalars().all():
+            comisaria = self._model_to_entity(db_comisaria)
+            comisarias[comisaria.codigo] = comisaria
+            _CODIGO_CACHE[comisaria.codigo] = (expiracion, comisaria)
+
+        return comisarias
+
+    @consulta_cacheada(ttl=60.0)
+    async def list_all(self) -> List[Comisaria]:
+        """Listar todas las comisarías (cacheado 60 s por proceso)"""
+        result = await self.session.execute(
+            select(ComisariaModel).order_by(ComisariaModel.created_at.desc())
+        )
+        db_comisarias = result.scalars().all()
+
+        return [self._model_to_entity(db_comisaria) for db_comisaria in db_comisarias]
+
+    @invalida_consultas
+    async def update(self, comisaria_id: int, comisaria_data: dict) -> Optional[Comisaria]:
+        """Actualizar una comisaría"""
+        result = await self.session.execute(
+            select(ComisariaModel).where(ComisariaModel.id == comisaria_id)
+        )
+        db_comisaria = result.scalar_one_or_none()
+
+        if db_comisaria is None:
+            return None
+
+        # Actualizar campos
+        for field, value in comisaria_data.items():
+            if hasattr(db_comisaria, field):
+                setattr(db_comisaria, field, value)
+
+        await self.session.flush()
+        await self.session.refresh(db_comisaria)
+
+        _CODIGO_CACHE.clear()
+
+        return self._model_to_entity(db_comisaria)
+
+    @invalida_consultas
+    async def delete(self, comisaria_id: int) -> bool:
+        """Eliminar una comisaría"""
+        result = await self.session.execute(
+            select(ComisariaModel).where(ComisariaModel.id == comisaria_id)
+        )
+        db_comisaria = result.scalar_one_or_none()
+
+        if db_comisaria is None:
+            return False
+
+        await self.session.delete(db_comisaria)
+        _CODIGO_CACHE.clear()
+        return True
+
+    def _model_to_entity(self, db_comisaria: ComisariaModel) -> Comisaria:
+        """Convertir modelo SQLAlchemy a entidad de dominio"""
+        from app.domain.entities.comisaria import Ubicacion, Coordenadas
+
+        # Reconstruir ubicación desde JSON
+        ubicacion_data = db_comisaria.ubicacion
+        coordenadas = Coordenadas(
+            lat=ubicacion_data["coordenadas"]["lat"],
+            lng=ubicacion_data["coordenadas"]["lng"]
+        )
+        ubicacion = Ubicacion(
+            direccion=ubicacion_data["direccion"],
+            distrito=ubicacion_data["distrito"],
+            provincia=ubicacion_data["provincia"],
+            departamento=ubicacion_data["departamento"],
+            coordenadas=coordenadas,
+            google_place_id=ubicacion_data.get("google_place_id")
+        )
+
+        return Comisaria(
+            id=db_comisaria.id,
+            nombre=db_comisaria.nombre,
+            codigo=db_comisaria.codigo,
+            tipo=db_comisaria.tipo,
+            ubicacion=ubicacion,
+            estado=db_comisaria.estado,
+            presupuesto_total=db_comisaria.presupuesto_total,
+            esta_retrasada=db_comisaria.esta_retrasada,
+            foto_url=db_comisaria.foto_url,
+            created_at=db_comisaria.created_at,
+            updated_at=db_comisaria.updated_at
         )
\ No newline at end of file
@@ -4,10 +4,11 @@ FastAPI application with Clean Architecture.
 Entry point para el sistema ERP.
 """
 from contextlib import asynccontextmanager
+from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 
 from app.core.config import settings
 from app.core.database import init_db, close_db
@@ -24,6 +25,11 @@ async def lifespan(app: FastAPI):
     print(f"🚀 Iniciando {settings.PROJECT_NAME} v{settings.VERSION} - DB Persistence Test")
     print(f"🌍 Entorno: {settings.ENVIRONMENT}")
 
+    # 📁 Crear directorio de uploads una sola vez aquí: los servicios
+    # (plantillas, imports Excel) asumen que existe y no pagan un
+    # mkdir + EEXIST por request
+    Path(settings.UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
+
     # Intentar activar base de datos SQLite
     try:
         await init_db()
@@ -47,6 +53,9 @@ app = FastAPI(
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
     openapi_url=f"{settings.API_PREFIX}/openapi.json" if settings.DEBUG else None,
+    # orjson serializa los payloads grandes (dashboard, listados de
+    # comisarías) varias veces más rápido que el json de la stdlib
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
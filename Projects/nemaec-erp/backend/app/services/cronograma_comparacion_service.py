@@ -89,51 +89,47 @@ class CronogramaComparacionService:
         mapa_originales = {p['codigo_partida']: p for p in partidas_originales}
         mapa_nuevas = {p['codigo_partida']: p for p in partidas_nuevas}
 
-        # Detectar cambios
+        # Detectar cambios y acumular impactos en las mismas pasadas
+        # (asegurar que todo sea Decimal)
         partidas_eliminadas = []
         partidas_nuevas_lista = []
         partidas_modificadas = []
+        impacto_reducciones = Decimal('0.00')
+        impacto_adicionales = Decimal('0.00')
+        impacto_modificadas = Decimal('0.00')
 
         # 1. Detectar partidas eliminadas (están en original pero no en nuevo)
         for codigo, partida_original in mapa_originales.items():
             if codigo not in mapa_nuevas:
                 partidas_eliminadas.append(partida_original)
+                impacto_reducciones += Decimal(str(partida_original['precio_total']))
 
-        # 2. Detectar partidas nuevas (están en nuevo pero no en original)
+        # 2. Detectar partidas nuevas y modificadas en un solo recorrido
+        # del cronograma nuevo
         for codigo, partida_nueva in mapa_nuevas.items():
-            if codigo not in mapa_originales:
-                partidas_nuevas_lista.append(partida_nueva)
+            partida_original = mapa_originales.get(codigo)
 
-        # 3. Detectar partidas modificadas (mismo código pero diferentes valores)
-        for codigo, partida_nueva in mapa_nuevas.items():
-            if codigo in mapa_originales:
-                partida_original = mapa_originales[codigo]
-
-                # Comparar campos relevantes
-                if self._partida_fue_modificada(partida_original, partida_nueva):
-                    partidas_modificadas.append({
-                        'codigo_partida': codigo,
-                        'original': partida_original,
-                        'nueva': partida_nueva,
-                        'campos_modificados': self._obtener_campos_modificados(partida_original, partida_nueva)
-                    })
-
-        # Calcular impacto presupuestal (asegurar que todo sea Decimal)
-        impacto_reducciones = Decimal('0.00')
-        for p in partidas_eliminadas:
-            impacto_reducciones += Decimal(str(p['precio_total']))
-
-        impacto_adicionales = Decimal('0.00')
-        for p in partidas_nuevas_lista:
-            impacto_adicionales += Decimal(str(p['precio_total']))
+            if partida_original is None:
+                partidas_nuevas_lista.append(partida_nueva)
+                impacto_adicionales += Decimal(str(partida_nueva['precio_total']))
+                continue
 
-        # Para modificadas, considerar diferencia de precio
-        impacto_modificadas = Decimal('0.00')
-        for mod in partidas_modificadas:
-            precio_original = Decimal(str(mod['original']['precio_total']))
-            precio_nuevo = Decimal(str(mod['nueva']['precio_total']))
-            diferencia = precio_nuevo - precio_original
-            impacto_modificadas += diferencia
+            # Comparar campos relevantes una sola vez: la lista de campos
+            # modificados ya dice si hubo cambio
+            campos_modificados = self._obtener_campos_modificados(
+                partida_original, partida_nueva
+            )
+            if campos_modificados:
+                partidas_modificadas.append({
+                    'codigo_partida': codigo,
+                    'original': partida_original,
+                    'nueva': partida_nueva,
+                    'campos_modificados': campos_modificados
+                })
+                # Para modificadas, considerar diferencia de precio
+                precio_original = Decimal(str(partida_original['precio_total']))
+                precio_nuevo = Decimal(str(partida_nueva['precio_total']))
+                impacto_modificadas += precio_nuevo - precio_original
 
         balance_preliminar = impacto_adicionales - impacto_reducciones + impacto_modificadas
 
@@ -160,21 +156,7 @@ class CronogramaComparacionService:
 
     def _partida_fue_modificada(self, original: Dict[str, Any], nueva: Dict[str, Any]) -> bool:
         """Verificar si una partida fue modificada"""
-        campos_a_comparar = ['descripcion', 'unidad', 'metrado', 'precio_unitario', 'precio_total']
-
-        for campo in campos_a_comparar:
-            valor_original = original.get(campo)
-            valor_nuevo = nueva.get(campo)
-
-            # Para campos numéricos, usar umbral de diferencia
-            if isinstance(valor_original, Decimal) and isinstance(valor_nuevo, Decimal):
-                if abs(valor_original - valor_nuevo) > self.umbral_diferencia:
-                    return True
-            else:
-                if str(valor_original) != str(valor_nuevo):
-                    return True
-
-        return False
+        return bool(self._obtener_campos_modificados(original, nueva))
 
     def _obtener_campos_modificados(self, original: Dict[str, Any], nueva: Dict[str, Any]) -> List[str]:
         """Obtener lista de campos que fueron modificados"""